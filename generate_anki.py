@@ -94,14 +94,14 @@ DECKS = {
 
 # ── Furigana helpers ────────────────────────────────────────────────
 
+# Compiled once: to_ruby_html runs on every field of every note
+_RUBY_RE = re.compile(r'([\u4e00-\u9fff\u3400-\u4dbf]+)【([^】]+)】')
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[。」]) ')
+
 
 def to_ruby_html(text):
     """Convert 漢字【かんじ】 to <ruby>漢字<rt>かんじ</rt></ruby>."""
-    return re.sub(
-        r'([\u4e00-\u9fff\u3400-\u4dbf]+)【([^】]+)】',
-        r'<ruby>\1<rt>\2</rt></ruby>',
-        text,
-    )
+    return _RUBY_RE.sub(r'<ruby>\1<rt>\2</rt></ruby>', text)
 
 
 # ── Card models ─────────────────────────────────────────────────────
@@ -561,7 +561,7 @@ def build_listening_decks(lang_cfg):
             missing.append(f"stories/{st['id']}: audio/s/{st.get('audio_file', '?')}")
             continue
         media.append(path)
-        paras = [p for p in re.split(r'(?<=[。」]) ', st['minihongo']) if p.strip()]
+        paras = [p for p in _SENTENCE_SPLIT_RE.split(st['minihongo']) if p.strip()]
         transcript = ''.join(f'<p>{to_ruby_html(p)}</p>' for p in paras)
         translation = st.get(trans_col, '') if trans_col else ''
         story_deck.add_note(genanki.Note(
@@ -24,12 +24,15 @@ Requires: ffmpeg (for merging dialog/story audio)
 import asyncio
 import csv
 import hashlib
+import io
 import json
 import os
 import re
 import subprocess
 import sys
 import tempfile
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
 
 from mh_common import DATA, load_csv, strip_furigana
@@ -131,6 +134,18 @@ def kana_to_romaji(text):
 # ── Text processing ─────────────────────────────────────────────────
 
 _FURIGANA_EXTRACT_RE = re.compile(r'([^【]*)【([^】]+)】')
+_FURIGANA_READING_RE = re.compile(r'[\u4e00-\u9fff\u3400-\u4dbf]+【([^】]+)】')
+_TTS_FURIGANA_RE = re.compile(r'[\u4e00-\u9fff\u3400-\u4dbf々]+【([^】]+)】')
+_NON_KANA_RE = re.compile(r'[、。！？・\s/]')
+_PARTICLE_HA_RE = re.compile(r'(?<=[ぁ-ん])は')
+_SLASH_SEP_RE = re.compile(r'\s*/\s*')
+_ARROW_SEP_RE = re.compile(r'\s*→\s*')
+_WHITESPACE_RE = re.compile(r'\s+')
+_MULTI_PERIOD_RE = re.compile(r'。+')
+_MULTI_COMMA_RE = re.compile(r'、+')
+_MULTI_UNDERSCORE_RE = re.compile(r'_+')
+_BRACKET_RE = re.compile(r'【[^】]*】')
+_CIRCLE_RE = re.compile(r'[○〇]')
 
 
 def extract_reading(text):
@@ -149,7 +164,7 @@ def extract_reading(text):
         parts.append(text[last:])
     reading = ''.join(parts)
     # Clean up non-kana leftovers
-    reading = re.sub(r'[、。！？・\s/]', '', reading)
+    reading = _NON_KANA_RE.sub('', reading)
     return reading
 
 
@@ -160,7 +175,7 @@ def furigana_to_reading(text):
     """
     # Replace kanji+【reading】 with just reading
     # \S+【 would eat kana too, so only match CJK ideographs before 【
-    return re.sub(r'[\u4e00-\u9fff\u3400-\u4dbf]+【([^】]+)】', r'\1', text)
+    return _FURIGANA_READING_RE.sub(r'\1', text)
 
 
 # Kanji that TTS mispronounces when converted to hiragana.
@@ -183,21 +198,21 @@ def text_for_tts(text):
             return kanji
         return reading
 
-    text = re.sub(r'[\u4e00-\u9fff\u3400-\u4dbf々]+【([^】]+)】', _replace, text)
+    text = _TTS_FURIGANA_RE.sub(_replace, text)
     # Particle は after hiragana should be read as "wa", not "ha".
     # All は-reading kanji (母,花,鼻,入,始,歯,半,払) are in _KEEP_KANJI,
     # so any remaining は after a hiragana char is a particle.
-    text = re.sub(r'(?<=[ぁ-ん])は', 'わ', text)
+    text = _PARTICLE_HA_RE.sub('わ', text)
     # Strip quote brackets
     text = text.replace('「', '').replace('」', '')
     # Convert separators to pauses
-    text = re.sub(r'\s*/\s*', '。', text)
-    text = re.sub(r'\s*→\s*', '。', text)
+    text = _SLASH_SEP_RE.sub('。', text)
+    text = _ARROW_SEP_RE.sub('。', text)
     # Remaining inner whitespace becomes a short pause (Japanese comma)
-    text = re.sub(r'\s+', '、', text.strip())
+    text = _WHITESPACE_RE.sub('、', text.strip())
     # Clean double punctuation
-    text = re.sub(r'。+', '。', text)
-    text = re.sub(r'、+', '、', text)
+    text = _MULTI_PERIOD_RE.sub('。', text)
+    text = _MULTI_COMMA_RE.sub('、', text)
     # Ensure sentence ends with punctuation
     text = text.strip()
     if text and text[-1] not in '。！？、':
@@ -205,8 +220,13 @@ def text_for_tts(text):
     return text
 
 
+@lru_cache(maxsize=None)
 def to_romaji_filename(text, reading_col=''):
-    """Convert Japanese text to romaji filename."""
+    """Convert Japanese text to romaji filename.
+
+    Cached: the words pass calls this twice per row (once for collision
+    detection, once for the actual filename).
+    """
     if reading_col:
         # Compounds have an explicit reading column
         return kana_to_romaji(reading_col)
@@ -215,7 +235,7 @@ def to_romaji_filename(text, reading_col=''):
         reading = strip_furigana(text)
     romaji = kana_to_romaji(reading)
     # Truncate long names, deduplicate underscores
-    romaji = re.sub(r'_+', '_', romaji).strip('_')
+    romaji = _MULTI_UNDERSCORE_RE.sub('_', romaji).strip('_')
     if len(romaji) > 60:
         romaji = romaji[:60]
     return romaji or 'unknown'
@@ -525,7 +545,7 @@ async def gen_dialogs():
         tmp_parts = []
         with tempfile.TemporaryDirectory() as tmp:
             for i, line in enumerate(lines):
-                speaker = re.sub(r'【[^】]*】', '', line['speaker_minihongo'])
+                speaker = _BRACKET_RE.sub('', line['speaker_minihongo'])
                 voice = VOICE_FEMALE if speaker in ('B', '母', '女') else VOICE_MALE
                 tts_text = text_for_tts(line['minihongo'])
                 part_path = Path(tmp) / f'{i:03d}.mp3'
@@ -610,7 +630,7 @@ async def gen_comprehension():
     results = []
     for row in rows:
         num = id_num(row['id'])
-        romaji = to_romaji_filename(re.sub(r'[○〇]', '', row['japanese']))
+        romaji = to_romaji_filename(_CIRCLE_RE.sub('', row['japanese']))
         filename = f'u_{num}_{romaji}.mp3'
         if len(filename) > 80:
             filename = f'u_{num}.mp3'
@@ -671,10 +691,12 @@ def update_csv(name, results, id_field='id', audio_field='audio_file'):
         elif audio_field not in row:
             row[audio_field] = ''
 
-    with open(path, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames, lineterminator='\n')
-        writer.writeheader()
-        writer.writerows(rows)
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator='\n')
+    writer.writerow(fieldnames)
+    # itemgetter does the per-row field extraction in C
+    writer.writerows(map(itemgetter(*fieldnames), rows))
+    path.write_text(buf.getvalue(), encoding='utf-8', newline='')
 
 
 def update_words_csv(results):
@@ -699,10 +721,12 @@ def update_words_csv(results):
             row.setdefault('audio_word', '')
             row.setdefault('audio_example', '')
 
-    with open(path, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames, lineterminator='\n')
-        writer.writeheader()
-        writer.writerows(rows)
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator='\n')
+    writer.writerow(fieldnames)
+    # itemgetter does the per-row field extraction in C
+    writer.writerows(map(itemgetter(*fieldnames), rows))
+    path.write_text(buf.getvalue(), encoding='utf-8', newline='')
 
 
 def update_datapackage():
@@ -730,9 +754,13 @@ def update_datapackage():
             if 'audio_file' not in field_names:
                 fields.append(audio_field)
 
-    with open(path, 'w', encoding='utf-8') as f:
-        json.dump(pkg, f, indent=2, ensure_ascii=False)
-        f.write('\n')
+    try:
+        import orjson  # ~3x faster serializer; stdlib json is the fallback
+        path.write_bytes(orjson.dumps(pkg, option=orjson.OPT_INDENT_2) + b'\n')
+    except ImportError:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(pkg, f, indent=2, ensure_ascii=False)
+            f.write('\n')
 
 
 # ── Main ────────────────────────────────────────────────────────────
@@ -1,15 +1,20 @@
 #!/usr/bin/env python3
 """Generate lesson HTML pages from CSV data for all languages."""
 import hashlib
-import html as html_mod
+import io
+import json
 import re
 import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
-from collections import defaultdict
+from collections import Counter, defaultdict, namedtuple
 
-from mh_common import LANGS, LANG_COL, load_csv, strip_furigana
+from mh_common import DATA, LANGS, LANG_COL, load_csv, strip_furigana
 
 PAGES_OUT = Path('site/pages')
+BUILD_CACHE = PAGES_OUT / '.build_cache.json'
 
 PAGE_FILES = {
     'vocabulary': 'vocabulary.html',
@@ -29,6 +34,9 @@ WB_DESC_KEYS = {
 
 UI_STRINGS = {}
 PAGE_DATA = []
+PAGE_BY_ID = {}
+PAGE_IDS = []
+PAGE_NAV = {}
 
 
 def play_btn(subdir, audio_file):
@@ -43,16 +51,25 @@ def play_btn(subdir, audio_file):
 def load_ui_strings():
     global UI_STRINGS
     UI_STRINGS = {r['key']: r for r in load_csv('ui_strings')}
+    ui.cache_clear()
 
 
 def load_page_data():
-    global PAGE_DATA
-    PAGE_DATA = sorted(load_csv('pages'), key=lambda r: int(r['sort_order']))
+    global PAGE_DATA, PAGE_BY_ID, PAGE_IDS, PAGE_NAV
+    PAGE_DATA = sorted(load_csv('pages'), key=itemgetter('sort_order'))
+    PAGE_BY_ID = {r['id']: r for r in PAGE_DATA}
+    PAGE_IDS = [r['id'] for r in PAGE_DATA]
+    PAGE_NAV = {
+        pid: (PAGE_IDS[i - 1] if i > 0 else None,
+              PAGE_IDS[i + 1] if i < len(PAGE_IDS) - 1 else None)
+        for i, pid in enumerate(PAGE_IDS)
+    }
 
 
 # -- Helpers ------------------------------------------------------------------
 
-def ui(key, lang):
+@lru_cache(maxsize=None)
+def ui(key: str, lang: str) -> str:
     """Get UI string with fallback: lang -> en -> mh."""
     row = UI_STRINGS.get(key)
     if not row:
@@ -64,18 +81,29 @@ def ui(key, lang):
     return key
 
 
-def t(row, field, lang):
+@lru_cache(maxsize=None)
+def _t_cols(field, lang):
+    """Column names to probe for a translated field, in fallback order."""
+    langs = (LANG_COL[lang], 'english', 'minihongo')
+    if field:
+        return tuple(f'{field}_{l}' for l in langs)
+    return langs
+
+
+def t(row: dict, field: str, lang: str) -> str:
     """Get translated field with fallback: lang -> en -> mh."""
-    for l in [LANG_COL[lang], 'english', 'minihongo']:
-        col = f'{field}_{l}' if field else l
+    for col in _t_cols(field, lang):
         val = row.get(col, '').strip()
         if val:
             return val
     return ''
 
 
-def render(text):
+@lru_cache(maxsize=None)
+def render(text: str) -> str:
     """Escape HTML then convert bracket notation to ruby. Safe for plain text."""
+    if '【' not in text:
+        return esc(text)
     return to_ruby_html(esc(text))
 
 
@@ -88,21 +116,69 @@ def page_desc(page_row, lang):
     return ''
 
 
-def to_ruby_html(text):
+# Compiled once at import: these run per cell, per row, per language.
+_RUBY_RE = re.compile(r'([\u4e00-\u9fff々]+)【([^】]+)】')
+_FURIGANA_RE = re.compile(r'【[^】]+】')
+_RUBY_TAG_RE = re.compile(r'<ruby>|</ruby>|<rt>[^<]*</rt>')
+_TAG_RE = re.compile(r'<rt>[^<]*</rt>|<[^>]+>')
+_ROMAJI_PAREN_RE = re.compile(r'\s*\(([A-Za-z &/\-]+)\)')
+_ROMAJI_TAIL_RE = re.compile(r'\(([A-Za-z &/\-]+)\)$')
+
+# One-pass equivalent of html.escape(text, quote=False)
+_HTML_ESC_TABLE = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;'})
+
+_SLUG_STRIP_RE = re.compile(r'[^a-z0-9\s-]')
+_SLUG_COLLAPSE_RE = re.compile(r'[\s-]+')
+
+
+def _split_story(text):
+    """Split story text into sentences on '\u3002 ' / '\u300d ' boundaries.
+
+    A plain scan for the two fixed delimiters; the lookbehind regex this
+    replaces was the slowest part of rendering stories.
+    """
+    paras = []
+    start = 0
+    i = text.find(' ', 1)
+    while i != -1:
+        if text[i - 1] in '\u3002\u300d':
+            paras.append(text[start:i])
+            start = i + 1
+        i = text.find(' ', i + 1)
+    paras.append(text[start:])
+    return paras
+
+
+# Row templates shared across languages: format_map reuses one constant
+# string instead of rebuilding the same f-string shape thousands of times.
+_VOCAB_ROW_TMPL = (
+    '      <tr><td lang="ja">{pb_w}{word}</td>'
+    '<td>{meaning}</td><td lang="ja">{pb_e}{example}</td></tr>\n'
+)
+_COMPOUND_ROW_TMPL = '      <tr><td lang="ja">{pb}{word}</td><td>{meaning}</td></tr>\n'
+_COMMON_ROW_TMPL = '    <tr><td lang="ja">{pb}{mh}</td><td>{meaning}</td></tr>\n'
+_CONCEPT_ROW_TMPL = (
+    '      <tr><td>{english}</td><td lang="ja">{pb}{mh}</td>'
+    '<td>{literally}</td></tr>\n'
+)
+
+
+@lru_cache(maxsize=None)
+def to_ruby_html(text: str) -> str:
     """Convert bracket notation 人【ひと】 to <ruby>人<rt>ひと</rt></ruby>."""
-    return re.sub(
-        r'([\u4e00-\u9fff々]+)【([^】]+)】',
-        r'<ruby>\1<rt>\2</rt></ruby>',
-        text,
-    )
+    if '【' not in text:  # most English/romaji cells have no furigana
+        return text
+    return _RUBY_RE.sub(r'<ruby>\1<rt>\2</rt></ruby>', text)
 
 
-def esc(text):
+@lru_cache(maxsize=None)
+def esc(text: str) -> str:
     """Escape HTML special characters in text content."""
-    return html_mod.escape(text, quote=False)
+    return text.translate(_HTML_ESC_TABLE)
 
 
-def bilingual(mh, translated):
+@lru_cache(maxsize=None)
+def bilingual(mh: str, translated: str) -> str:
     """Format bilingual heading."""
     if mh == translated or not translated:
         return to_ruby_html(esc(mh))
@@ -111,80 +187,174 @@ def bilingual(mh, translated):
 
 def by_sort(rows):
     """Sort rows by sort_order."""
-    return sorted(rows, key=lambda r: int(r['sort_order']))
+    return sorted(rows, key=itemgetter('sort_order'))
 
 
-def slugify(text):
+@lru_cache(maxsize=None)
+def slugify(text: str) -> str:
     """Create URL-friendly ID from text."""
     text = text.lower()
     text = text.replace('→', 'to').replace('∞', 'infinity')
-    text = re.sub(r'[^a-z0-9\s-]', '', text)
-    text = re.sub(r'[\s-]+', '-', text.strip())
+    text = _SLUG_STRIP_RE.sub('', text)
+    text = _SLUG_COLLAPSE_RE.sub('-', text.strip())
     return text
 
 
+# -- Derived indexes ----------------------------------------------------------
+
+Indexes = namedtuple('Indexes', [
+    'cats_by_page',        # page_id -> categories, sorted
+    'h2_by_page',          # page_id -> top-level categories, sorted
+    'children_by_parent',  # parent category id -> child categories, sorted
+    'words_by_cat',        # category_id -> words, sorted
+    'gram_by_cat',         # category_id -> grammar points, sorted
+    'ex_by_gram',          # grammar_id -> examples, sorted
+    'compounds_by_cat',    # category_id -> compounds, sorted
+    'expressions_by_cat',  # category_id -> expressions, sorted
+    'advanced_by_cat',     # category_id -> advanced rows, sorted
+    'mh_for_target',       # japanese word -> circumlocution expression
+    'haiku_by_cat',        # category_id -> haiku, sorted
+    'dgrp_by_cat',         # category_id -> dialog groups, sorted
+    'dlg_by_grp',          # dialog_group_id -> lines, by line_number
+    'stories_by_cat',      # category_id -> stories, sorted
+    'items_by_cat',        # category_id -> comprehension rows, sorted
+    'dg_by_id',            # dialog group id -> row
+    'blankable',           # words with furigana, longest first
+])
+
+
+def _group_sorted(rows, key):
+    """Bucket rows by a foreign-key column, each bucket in sort_order."""
+    # Count first so each bucket is allocated at its final size, then fill.
+    counts = Counter(r[key] for r in rows)
+    grouped = {k: [None] * n for k, n in counts.items()}
+    fill = dict.fromkeys(counts, 0)
+    for r in rows:
+        k = r[key]
+        grouped[k][fill[k]] = r
+        fill[k] += 1
+    for k in grouped:
+        grouped[k] = by_sort(grouped[k])
+    return grouped
+
+
+def build_indexes(categories, words, grammar, grammar_examples, compounds,
+                  expressions, advanced, haiku, dialog_groups, dialogs,
+                  stories, comprehension):
+    """Group and sort the language-independent row sets once.
+
+    The gen_* functions used to rebuild these on every one of the three
+    language passes even though none of them depend on the language.
+    """
+    h2_by_page = defaultdict(list)
+    children_by_parent = defaultdict(list)
+    for c in categories:
+        if c['parent_id']:
+            children_by_parent[c['parent_id']].append(c)
+        else:
+            h2_by_page[c['page_id']].append(c)
+    for k in h2_by_page:
+        h2_by_page[k] = by_sort(h2_by_page[k])
+    for k in children_by_parent:
+        children_by_parent[k] = by_sort(children_by_parent[k])
+
+    dlg_by_grp = defaultdict(list)
+    for d in dialogs:
+        dlg_by_grp[d['dialog_group_id']].append(d)
+    for k in dlg_by_grp:
+        dlg_by_grp[k].sort(key=itemgetter('line_number'))
+
+    mh_for_target = {}
+    for e in by_sort(expressions):
+        if e['japanese']:
+            mh_for_target.setdefault(e['japanese'], e)
+
+    # Longest words first so the cloze blanks the most specific match
+    blankable = sorted(
+        [w for w in words if '【' in w['minihongo']],
+        key=lambda w: len(_plain_mh(w['minihongo'])),
+        reverse=True,
+    )
+
+    return Indexes(
+        cats_by_page=_group_sorted(categories, 'page_id'),
+        h2_by_page=h2_by_page,
+        children_by_parent=children_by_parent,
+        words_by_cat=_group_sorted(words, 'category_id'),
+        gram_by_cat=_group_sorted(grammar, 'category_id'),
+        ex_by_gram=_group_sorted(grammar_examples, 'grammar_id'),
+        compounds_by_cat=_group_sorted(compounds, 'category_id'),
+        expressions_by_cat=_group_sorted(expressions, 'category_id'),
+        advanced_by_cat=_group_sorted(advanced, 'category_id'),
+        mh_for_target=mh_for_target,
+        haiku_by_cat=_group_sorted(haiku, 'category_id'),
+        dgrp_by_cat=_group_sorted(dialog_groups, 'category_id'),
+        dlg_by_grp=dlg_by_grp,
+        stories_by_cat=_group_sorted(stories, 'category_id'),
+        items_by_cat=_group_sorted(comprehension, 'category_id'),
+        dg_by_id={d['id']: d for d in dialog_groups},
+        blankable=blankable,
+    )
+
+
 # -- Page wrapper -------------------------------------------------------------
 
 def get_page(page_id):
     """Get page data row by id."""
-    for p in PAGE_DATA:
-        if p['id'] == page_id:
-            return p
-    return None
+    return PAGE_BY_ID.get(page_id)
+
+
+def render_toc(toc):
+    """Render a TOC list - entries are (slug, label) or (slug, label, children)."""
+    if not toc:
+        return ''
+    lines = []
+    has_details = any(len(e) > 2 and e[2] for e in toc)
+    cls = 'toc toc-collapsible' if has_details else 'toc'
+    lines.append(f'  <nav class="{cls}">\n')
+    lines.append('    <ul>\n')
+    for entry in toc:
+        slug, label = entry[0], entry[1]
+        children = entry[2] if len(entry) > 2 else []
+        if children:
+            lines.append(f'      <li>\n')
+            lines.append(f'        <details>\n')
+            lines.append(f'          <summary><a href="#{slug}">{label}</a></summary>\n')
+            lines.append(f'          <ul>\n')
+            for cs, cl in children:
+                lines.append(f'            <li><a href="#{cs}">{cl}</a></li>\n')
+            lines.append(f'          </ul>\n')
+            lines.append(f'        </details>\n')
+            lines.append(f'      </li>\n')
+        else:
+            lines.append(f'      <li><a href="#{slug}">{label}</a></li>\n')
+    lines.append('    </ul>\n')
+    lines.append('  </nav>\n\n')
+    return ''.join(lines)
 
 
-def wrap_page(page_id, content, lang, toc=None, pre_toc=''):
+def wrap_page(page_id, content, lang, toc_html='', pre_toc=''):
     """Wrap section content in page-layout template."""
     page = get_page(page_id)
     title_raw = t(page, 'name', lang)
-    title_plain = re.sub(r'【[^】]+】', '', title_raw)
+    title_plain = _FURIGANA_RE.sub('', title_raw)
     title = to_ruby_html(title_raw)
     desc = page_desc(page, lang)
-    site_name_plain = re.sub(r'<ruby>|</ruby>|<rt>[^<]*</rt>', '', ui('site_name', lang))
+    site_name_plain = _RUBY_TAG_RE.sub('', ui('site_name', lang))
     site_name = ui('site_name', lang)
 
-    # TOC - each entry is (slug, label) or (slug, label, children)
-    toc_html = ''
-    if toc:
-        lines = []
-        has_details = any(len(e) > 2 and e[2] for e in toc)
-        cls = 'toc toc-collapsible' if has_details else 'toc'
-        lines.append(f'  <nav class="{cls}">\n')
-        lines.append('    <ul>\n')
-        for entry in toc:
-            slug, label = entry[0], entry[1]
-            children = entry[2] if len(entry) > 2 else []
-            if children:
-                lines.append(f'      <li>\n')
-                lines.append(f'        <details>\n')
-                lines.append(f'          <summary><a href="#{slug}">{label}</a></summary>\n')
-                lines.append(f'          <ul>\n')
-                for cs, cl in children:
-                    lines.append(f'            <li><a href="#{cs}">{cl}</a></li>\n')
-                lines.append(f'          </ul>\n')
-                lines.append(f'        </details>\n')
-                lines.append(f'      </li>\n')
-            else:
-                lines.append(f'      <li><a href="#{slug}">{label}</a></li>\n')
-        lines.append('    </ul>\n')
-        lines.append('  </nav>\n\n')
-        toc_html = ''.join(lines)
-
-    # Nav links from sorted page list
-    page_ids = [p['id'] for p in PAGE_DATA]
-    idx = page_ids.index(page_id)
-
-    if idx > 0:
-        prev_id = page_ids[idx - 1]
-        prev_label = to_ruby_html(t(get_page(prev_id), 'name', lang))
+    # Nav links from the precomputed prev/next map
+    prev_id, next_id = PAGE_NAV[page_id]
+
+    if prev_id:
+        prev_label = to_ruby_html(t(PAGE_BY_ID[prev_id], 'name', lang))
         prev_href = f'lessons/{PAGE_FILES[prev_id]}'
         prev_link = f'    <a href="{prev_href}">\u2190 {prev_label}</a>'
     else:
         prev_link = '    <span></span>'
 
-    if idx < len(page_ids) - 1:
-        next_id = page_ids[idx + 1]
-        next_label = to_ruby_html(t(get_page(next_id), 'name', lang))
+    if next_id:
+        next_label = to_ruby_html(t(PAGE_BY_ID[next_id], 'name', lang))
         next_href = f'lessons/{PAGE_FILES[next_id]}'
         next_link = f'    <a href="{next_href}">{next_label} \u2192</a>'
     else:
@@ -210,10 +380,10 @@ def wrap_page(page_id, content, lang, toc=None, pre_toc=''):
 
 # -- Homepage -----------------------------------------------------------------
 
-def strip_html(text):
+def strip_html(text: str) -> str:
     """Remove HTML tags and ruby reading text from text."""
-    text = re.sub(r'<rt>[^<]*</rt>', '', text)
-    return re.sub(r'<[^>]+>', '', text)
+    # One alternation pass: <rt> must come first so its content goes with it
+    return _TAG_RE.sub('', text)
 
 
 def gen_index(lang):
@@ -303,30 +473,27 @@ def gen_index(lang):
 
 # -- Vocabulary ---------------------------------------------------------------
 
-def gen_vocabulary(categories, words, lang):
-    cats = by_sort([c for c in categories if c['page_id'] == 'vocabulary'])
-    words_by_cat = defaultdict(list)
-    for w in words:
-        words_by_cat[w['category_id']].append(w)
+def gen_vocabulary(idx, lang):
+    cats = idx.cats_by_page.get('vocabulary', [])
 
     th_word = ui('th_word', lang)
     th_meaning = ui('th_meaning', lang)
     th_example = ui('th_example', lang)
 
     toc = []
-    parts = []
+    buf = io.StringIO()
     for cat in cats:
-        cat_words = by_sort(words_by_cat.get(cat['id'], []))
+        cat_words = idx.words_by_cat.get(cat['id'], [])
         slug = slugify(cat['name_english'])
         translated = t(cat, 'name', lang)
         h = bilingual(cat['name_minihongo'], translated)
         toc_label = translated or cat['name_english']
         toc.append((slug, to_ruby_html(esc(toc_label))))
-        parts.append(f'  <h2 id="{slug}" class="section-heading">{h}</h2>\n')
-        parts.append('\n')
-        parts.append('  <div class="table-scroll"><table class="compact-table">\n')
-        parts.append(f'    <thead><tr><th>{th_word}</th><th>{th_meaning}</th><th>{th_example}</th></tr></thead>\n')
-        parts.append('    <tbody>\n')
+        buf.write(f'  <h2 id="{slug}" class="section-heading">{h}</h2>\n')
+        buf.write('\n')
+        buf.write('  <div class="table-scroll"><table class="compact-table">\n')
+        buf.write(f'    <thead><tr><th>{th_word}</th><th>{th_meaning}</th><th>{th_example}</th></tr></thead>\n')
+        buf.write('    <tbody>\n')
         for w in cat_words:
             word = to_ruby_html(w['minihongo'])
             if lang == 'mh':
@@ -336,75 +503,72 @@ def gen_vocabulary(categories, words, lang):
             example = to_ruby_html(w['example_minihongo'])
             pb_w = play_btn('w', w.get('audio_word', ''))
             pb_e = play_btn('w', w.get('audio_example', ''))
-            parts.append(f'      <tr><td lang="ja">{pb_w}{word}</td><td>{meaning}</td><td lang="ja">{pb_e}{example}</td></tr>\n')
-        parts.append('    </tbody>\n')
-        parts.append('  </table></div>\n')
+            buf.write(_VOCAB_ROW_TMPL.format_map({
+                'pb_w': pb_w, 'word': word, 'meaning': meaning,
+                'pb_e': pb_e, 'example': example,
+            }))
+        buf.write('    </tbody>\n')
+        buf.write('  </table></div>\n')
         note = t(cat, 'note', lang)
         if note:
-            parts.append(f'  <p class="category-note">{to_ruby_html(esc(note))}</p>\n')
-        parts.append('\n')
+            buf.write(f'  <p class="category-note">{to_ruby_html(esc(note))}</p>\n')
+        buf.write('\n')
 
-    return wrap_page('vocabulary', ''.join(parts), lang, toc)
+    return wrap_page('vocabulary', buf.getvalue(), lang, render_toc(toc))
 
 
 # -- Grammar ------------------------------------------------------------------
 
-def gen_grammar(categories, grammar, grammar_examples, lang):
-    cats = by_sort([c for c in categories if c['page_id'] == 'grammar'])
-    gram_by_cat = defaultdict(list)
-    for g in grammar:
-        gram_by_cat[g['category_id']].append(g)
-    ex_by_gram = defaultdict(list)
-    for e in grammar_examples:
-        ex_by_gram[e['grammar_id']].append(e)
+def gen_grammar(idx, lang):
+    cats = idx.cats_by_page.get('grammar', [])
 
     # 3-patterns intro (rendered before TOC via pre_toc)
     toc = []
-    parts = []
-    intro = []
-    intro.append('  <div class="grammar-intro">\n')
+    buf = io.StringIO()
+    intro = io.StringIO()
+    intro.write('  <div class="grammar-intro">\n')
 
     # Pattern 1: Set the Stage
     p1_label = ui('grammar_pattern_1', lang)
-    intro.append(f'    <div class="grammar-intro__pattern">\n')
-    intro.append(f'      <h3>{p1_label} {play_btn("gi", "gi_1.mp3")}</h3>\n')
-    intro.append(f'      <div class="grammar-intro__example" lang="ja">\n')
-    intro.append(f'        <span class="grammar-intro__slot"><span>{to_ruby_html("私【わたし】は")}</span><em>{ui("grammar_slot_who", lang)}</em></span>\n')
-    intro.append(f'        <span class="grammar-intro__slot"><span>{to_ruby_html("昨日【きのう】")}</span><em>{ui("grammar_slot_when", lang)}</em></span>\n')
-    intro.append(f'        <span class="grammar-intro__slot"><span>{to_ruby_html("家【いえ】で")}</span><em>{ui("grammar_slot_where", lang)}</em></span>\n')
-    intro.append(f'        <span class="grammar-intro__slot"><span>{to_ruby_html("本【ほん】を")}</span><em>{ui("grammar_slot_what", lang)}</em></span>\n')
-    intro.append(f'        <span class="grammar-intro__slot"><span>{to_ruby_html("読【よ】んだ。")}</span><em>{ui("grammar_slot_action", lang)}</em></span>\n')
-    intro.append(f'      </div>\n')
-    intro.append(f'      <p class="grammar-intro__links">{ui("grammar_intro_1_links", lang)}</p>\n')
-    intro.append(f'    </div>\n')
+    intro.write(f'    <div class="grammar-intro__pattern">\n')
+    intro.write(f'      <h3>{p1_label} {play_btn("gi", "gi_1.mp3")}</h3>\n')
+    intro.write(f'      <div class="grammar-intro__example" lang="ja">\n')
+    intro.write(f'        <span class="grammar-intro__slot"><span>{to_ruby_html("私【わたし】は")}</span><em>{ui("grammar_slot_who", lang)}</em></span>\n')
+    intro.write(f'        <span class="grammar-intro__slot"><span>{to_ruby_html("昨日【きのう】")}</span><em>{ui("grammar_slot_when", lang)}</em></span>\n')
+    intro.write(f'        <span class="grammar-intro__slot"><span>{to_ruby_html("家【いえ】で")}</span><em>{ui("grammar_slot_where", lang)}</em></span>\n')
+    intro.write(f'        <span class="grammar-intro__slot"><span>{to_ruby_html("本【ほん】を")}</span><em>{ui("grammar_slot_what", lang)}</em></span>\n')
+    intro.write(f'        <span class="grammar-intro__slot"><span>{to_ruby_html("読【よ】んだ。")}</span><em>{ui("grammar_slot_action", lang)}</em></span>\n')
+    intro.write(f'      </div>\n')
+    intro.write(f'      <p class="grammar-intro__links">{ui("grammar_intro_1_links", lang)}</p>\n')
+    intro.write(f'    </div>\n')
 
     # Pattern 2: Chain Actions
     p2_label = ui('grammar_pattern_2', lang)
-    intro.append(f'    <div class="grammar-intro__pattern">\n')
-    intro.append(f'      <h3>{p2_label} {play_btn("gi", "gi_2.mp3")}</h3>\n')
-    intro.append(f'      <div class="grammar-intro__example" lang="ja">\n')
-    intro.append(f'        <span class="grammar-intro__slot"><span>{to_ruby_html("家【いえ】に帰【かえ】って")}</span><em>1</em></span>\n')
-    intro.append(f'        <span class="grammar-intro__slot"><span>{to_ruby_html("本【ほん】を読【よ】んで")}</span><em>2</em></span>\n')
-    intro.append(f'        <span class="grammar-intro__slot"><span>{to_ruby_html("寝【ね】た。")}</span><em>3</em></span>\n')
-    intro.append(f'      </div>\n')
-    intro.append(f'      <p class="grammar-intro__links">{ui("grammar_intro_2_links", lang)}</p>\n')
-    intro.append(f'    </div>\n')
+    intro.write(f'    <div class="grammar-intro__pattern">\n')
+    intro.write(f'      <h3>{p2_label} {play_btn("gi", "gi_2.mp3")}</h3>\n')
+    intro.write(f'      <div class="grammar-intro__example" lang="ja">\n')
+    intro.write(f'        <span class="grammar-intro__slot"><span>{to_ruby_html("家【いえ】に帰【かえ】って")}</span><em>1</em></span>\n')
+    intro.write(f'        <span class="grammar-intro__slot"><span>{to_ruby_html("本【ほん】を読【よ】んで")}</span><em>2</em></span>\n')
+    intro.write(f'        <span class="grammar-intro__slot"><span>{to_ruby_html("寝【ね】た。")}</span><em>3</em></span>\n')
+    intro.write(f'      </div>\n')
+    intro.write(f'      <p class="grammar-intro__links">{ui("grammar_intro_2_links", lang)}</p>\n')
+    intro.write(f'    </div>\n')
 
     # Pattern 3: Apply Filters
     p3_label = ui('grammar_pattern_3', lang)
-    intro.append(f'    <div class="grammar-intro__pattern">\n')
-    intro.append(f'      <h3>{p3_label} {play_btn("gi", "gi_3.mp3")}</h3>\n')
-    intro.append(f'      <div class="grammar-intro__example" lang="ja">\n')
-    intro.append(f'        <span class="grammar-intro__slot"><span>{to_ruby_html("読【よ】む")}</span><em>{ui("grammar_filter_base", lang)}</em></span>\n')
-    intro.append(f'        <span class="grammar-intro__slot"><span>{to_ruby_html("読【よ】んだ")}</span><em>{ui("grammar_filter_done", lang)}</em></span>\n')
-    intro.append(f'        <span class="grammar-intro__slot"><span>{to_ruby_html("読【よ】まない")}</span><em>{ui("grammar_filter_not", lang)}</em></span>\n')
-    intro.append(f'        <span class="grammar-intro__slot"><span>{to_ruby_html("読【よ】みます")}</span><em>{ui("grammar_filter_polite", lang)}</em></span>\n')
-    intro.append(f'      </div>\n')
-    intro.append(f'      <p class="grammar-intro__links">{ui("grammar_intro_3_links", lang)}</p>\n')
-    intro.append(f'    </div>\n')
-
-    intro.append('  </div>\n\n')
-    intro_html = ''.join(intro)
+    intro.write(f'    <div class="grammar-intro__pattern">\n')
+    intro.write(f'      <h3>{p3_label} {play_btn("gi", "gi_3.mp3")}</h3>\n')
+    intro.write(f'      <div class="grammar-intro__example" lang="ja">\n')
+    intro.write(f'        <span class="grammar-intro__slot"><span>{to_ruby_html("読【よ】む")}</span><em>{ui("grammar_filter_base", lang)}</em></span>\n')
+    intro.write(f'        <span class="grammar-intro__slot"><span>{to_ruby_html("読【よ】んだ")}</span><em>{ui("grammar_filter_done", lang)}</em></span>\n')
+    intro.write(f'        <span class="grammar-intro__slot"><span>{to_ruby_html("読【よ】まない")}</span><em>{ui("grammar_filter_not", lang)}</em></span>\n')
+    intro.write(f'        <span class="grammar-intro__slot"><span>{to_ruby_html("読【よ】みます")}</span><em>{ui("grammar_filter_polite", lang)}</em></span>\n')
+    intro.write(f'      </div>\n')
+    intro.write(f'      <p class="grammar-intro__links">{ui("grammar_intro_3_links", lang)}</p>\n')
+    intro.write(f'    </div>\n')
+
+    intro.write('  </div>\n\n')
+    intro_html = intro.getvalue()
 
     for cat in cats:
         slug = slugify(cat['name_english'])
@@ -413,7 +577,7 @@ def gen_grammar(categories, grammar, grammar_examples, lang):
         toc_label = translated or cat['name_english']
 
         toc_children = []
-        for gp in by_sort(gram_by_cat.get(cat['id'], [])):
+        for gp in idx.gram_by_cat.get(cat['id'], []):
             gp_slug = slugify(gp.get('english') or gp['id'])
             gp_toc_label = esc(gp.get('english') or gp['minihongo'])
             if gp.get('core', '').strip().lower() == 'yes':
@@ -421,20 +585,20 @@ def gen_grammar(categories, grammar, grammar_examples, lang):
             toc_children.append((gp_slug, gp_toc_label))
 
         toc.append((slug, to_ruby_html(esc(toc_label)), toc_children))
-        parts.append(f'  <h2 id="{slug}" class="section-heading">{h}</h2>\n')
-        parts.append('\n')
+        buf.write(f'  <h2 id="{slug}" class="section-heading">{h}</h2>\n')
+        buf.write('\n')
 
-        for gp in by_sort(gram_by_cat.get(cat['id'], [])):
+        for gp in idx.gram_by_cat.get(cat['id'], []):
             gp_slug = slugify(gp.get('english') or gp['id'])
             raw_pattern = gp['minihongo']
             if lang == 'mh':
                 # Strip romaji/english in parentheses: "は (wa)" -> "は"
-                raw_pattern = re.sub(r'\s*\([A-Za-z &/\-]+\)', '', raw_pattern).strip()
+                raw_pattern = _ROMAJI_PAREN_RE.sub('', raw_pattern).strip()
             pattern = to_ruby_html(raw_pattern)
             if lang == 'en' and gp.get('english'):
                 en_name = esc(gp['english'])
                 # Merge with existing romaji parenthetical: "は (wa)" -> "は (wa - Topic Marker)"
-                romaji_match = re.search(r'\(([A-Za-z &/\-]+)\)$', pattern)
+                romaji_match = _ROMAJI_TAIL_RE.search(pattern)
                 if romaji_match:
                     romaji = romaji_match.group(1)
                     pattern = pattern[:romaji_match.start()] + f'({romaji} - {en_name})'
@@ -443,47 +607,34 @@ def gen_grammar(categories, grammar, grammar_examples, lang):
             explanation = to_ruby_html(t(gp, 'explanation', lang))
             is_core = gp.get('core', '').strip().lower() == 'yes'
             tag = f'  <grammar-point id="{gp_slug}" class="core">\n' if is_core else f'  <grammar-point id="{gp_slug}">\n'
-            parts.append(tag)
-            parts.append(f'    <span slot="pattern">{pattern}</span>\n')
-            parts.append(f'    <span slot="explanation">{explanation}</span>\n')
+            buf.write(tag)
+            buf.write(f'    <span slot="pattern">{pattern}</span>\n')
+            buf.write(f'    <span slot="explanation">{explanation}</span>\n')
 
-            for ex in by_sort(ex_by_gram.get(gp['id'], [])):
+            for ex in idx.ex_by_gram.get(gp['id'], []):
                 mh = to_ruby_html(ex['minihongo'])
                 pb = play_btn('ge', ex.get('audio_file', ''))
-                parts.append('    <div class="sentence">\n')
-                parts.append(f'      <p lang="ja">{pb}{mh}</p>\n')
+                buf.write('    <div class="sentence">\n')
+                buf.write(f'      <p lang="ja">{pb}{mh}</p>\n')
                 if lang == 'en':
                     translated_ex = to_ruby_html(t(ex, '', lang))
-                    parts.append(f'      <p>{translated_ex}</p>\n')
-                parts.append('    </div>\n')
+                    buf.write(f'      <p>{translated_ex}</p>\n')
+                buf.write('    </div>\n')
 
-            parts.append('  </grammar-point>\n')
-            parts.append('\n')
+            buf.write('  </grammar-point>\n')
+            buf.write('\n')
 
-    return wrap_page('grammar', ''.join(parts), lang, toc, pre_toc=intro_html)
+    return wrap_page('grammar', buf.getvalue(), lang, render_toc(toc), pre_toc=intro_html)
 
 
 # -- Word Building ------------------------------------------------------------
 
-def gen_word_building(categories, compounds, expressions, lang):
-    compounds_by_cat = defaultdict(list)
-    for c in compounds:
-        compounds_by_cat[c['category_id']].append(c)
-    expressions_by_cat = defaultdict(list)
-    for e in expressions:
-        expressions_by_cat[e['category_id']].append(e)
-
-    h2_cats = by_sort([c for c in categories
-                       if c['page_id'] == 'word-building' and not c['parent_id']])
-    children = defaultdict(list)
-    for c in categories:
-        if c['page_id'] == 'word-building' and c['parent_id']:
-            children[c['parent_id']].append(c)
-    for k in children:
-        children[k] = by_sort(children[k])
+def gen_word_building(idx, lang):
+    h2_cats = idx.h2_by_page.get('word-building', [])
+    children = idx.children_by_parent
 
     toc = []
-    parts = []
+    buf = io.StringIO()
     for h2 in h2_cats:
         slug = slugify(h2['name_english'])
         translated = t(h2, 'name', lang)
@@ -498,55 +649,55 @@ def gen_word_building(categories, compounds, expressions, lang):
             toc_children.append((h3_slug, to_ruby_html(esc(h3_label))))
 
         toc.append((slug, to_ruby_html(esc(toc_label)), toc_children))
-        parts.append(f'  <h2 id="{slug}" class="section-heading">{h}</h2>\n')
+        buf.write(f'  <h2 id="{slug}" class="section-heading">{h}</h2>\n')
 
         desc_key = WB_DESC_KEYS.get(h2['name_english'], '')
         if desc_key:
             desc = ui(desc_key, lang)
-            parts.append(f'  <p>{desc}</p>\n')
+            buf.write(f'  <p>{desc}</p>\n')
             if desc_key == 'wb_desc_compounds':
                 warning = ui('wb_reading_warning', lang)
-                parts.append(f'  <p class="reading-warning">{warning}</p>\n')
-        parts.append('\n')
+                buf.write(f'  <p class="reading-warning">{warning}</p>\n')
+        buf.write('\n')
 
         for h3 in children.get(h2['id'], []):
             h3_slug = slugify(h3['name_english'])
             h3_translated = t(h3, 'name', lang)
             h3_heading = bilingual(h3['name_minihongo'], h3_translated)
-            parts.append(f'  <h3 id="{h3_slug}" class="section-heading">{h3_heading}</h3>\n')
+            buf.write(f'  <h3 id="{h3_slug}" class="section-heading">{h3_heading}</h3>\n')
 
-            cat_compounds = by_sort(compounds_by_cat.get(h3['id'], []))
-            cat_expressions = by_sort(expressions_by_cat.get(h3['id'], []))
+            cat_compounds = idx.compounds_by_cat.get(h3['id'], [])
+            cat_expressions = idx.expressions_by_cat.get(h3['id'], [])
 
             if cat_compounds:
-                _render_compound_table(parts, cat_compounds, lang)
+                _render_compound_table(buf, cat_compounds, lang)
             elif cat_expressions:
                 has_japanese = any(e['japanese'] for e in cat_expressions)
                 if has_japanese:
-                    _render_common_table(parts, cat_expressions, lang)
+                    _render_common_table(buf, cat_expressions, lang)
                 else:
-                    _render_concept_table(parts, cat_expressions, lang)
+                    _render_concept_table(buf, cat_expressions, lang)
 
-            parts.append('\n')
+            buf.write('\n')
 
-    return wrap_page('word-building', ''.join(parts), lang, toc)
+    return wrap_page('word-building', buf.getvalue(), lang, render_toc(toc))
 
 
 # -- Going Further ------------------------------------------------------------
 
-def _render_advanced_table(parts, rows, lang, mh_for_target):
+def _render_advanced_table(buf, rows, lang, mh_for_target):
     """Advanced vocab: real Japanese word (with furigana) + English meaning,
     plus the Word Building circumlocution when the core already covers the word.
     ja page shows no English gloss (native speakers need none)."""
     th_word = ui('th_word', lang)
     th_in_mh = ui('th_in_minihongo', lang)
-    parts.append('  <div class="table-scroll"><table class="compound-table">\n')
+    buf.write('  <div class="table-scroll"><table class="compound-table">\n')
     if lang == 'ja':
-        parts.append(f'    <thead><tr><th lang="ja">{th_word}</th><th lang="ja">{th_in_mh}</th></tr></thead>\n')
+        buf.write(f'    <thead><tr><th lang="ja">{th_word}</th><th lang="ja">{th_in_mh}</th></tr></thead>\n')
     else:
         th_english = ui('th_english', lang)
-        parts.append(f'    <thead><tr><th lang="ja">{th_word}</th><th>{th_english}</th><th lang="ja">{th_in_mh}</th></tr></thead>\n')
-    parts.append('    <tbody>\n')
+        buf.write(f'    <thead><tr><th lang="ja">{th_word}</th><th>{th_english}</th><th lang="ja">{th_in_mh}</th></tr></thead>\n')
+    buf.write('    <tbody>\n')
     for r in rows:
         pb = play_btn('a', r.get('audio_file', ''))
         word = to_ruby_html(r['japanese'])
@@ -555,36 +706,15 @@ def _render_advanced_table(parts, rows, lang, mh_for_target):
         if expr:
             mh_cell = f'{play_btn("e", expr.get("audio_file", ""))}{to_ruby_html(expr["minihongo"])}'
         if lang == 'ja':
-            parts.append(f'      <tr><td lang="ja">{pb}{word}</td><td lang="ja">{mh_cell}</td></tr>\n')
+            buf.write(f'      <tr><td lang="ja">{pb}{word}</td><td lang="ja">{mh_cell}</td></tr>\n')
         else:
-            parts.append(f'      <tr><td lang="ja">{pb}{word}</td><td>{esc(r["english"])}</td><td lang="ja">{mh_cell}</td></tr>\n')
-    parts.append('    </tbody>\n  </table></div>\n')
+            buf.write(f'      <tr><td lang="ja">{pb}{word}</td><td>{esc(r["english"])}</td><td lang="ja">{mh_cell}</td></tr>\n')
+    buf.write('    </tbody>\n  </table></div>\n')
 
 
-def gen_going_further(categories, compounds, expressions, advanced, lang):
-    compounds_by_cat = defaultdict(list)
-    for c in compounds:
-        compounds_by_cat[c['category_id']].append(c)
-    expressions_by_cat = defaultdict(list)
-    for e in expressions:
-        expressions_by_cat[e['category_id']].append(e)
-    advanced_by_cat = defaultdict(list)
-    for a in advanced:
-        advanced_by_cat[a['category_id']].append(a)
-
-    mh_for_target = {}
-    for e in by_sort(expressions):
-        if e['japanese']:
-            mh_for_target.setdefault(e['japanese'], e)
-
-    h2_cats = by_sort([c for c in categories
-                       if c['page_id'] == 'going-further' and not c['parent_id']])
-    children = defaultdict(list)
-    for c in categories:
-        if c['page_id'] == 'going-further' and c['parent_id']:
-            children[c['parent_id']].append(c)
-    for k in children:
-        children[k] = by_sort(children[k])
+def gen_going_further(idx, lang):
+    h2_cats = idx.h2_by_page.get('going-further', [])
+    children = idx.children_by_parent
 
     intro_html = (
         f'  <p>{ui("gf_intro_p1", lang)}</p>\n'
@@ -594,7 +724,7 @@ def gen_going_further(categories, compounds, expressions, advanced, lang):
     immerse_slug = 'live-in-the-language'
 
     toc = []
-    parts = []
+    buf = io.StringIO()
     for h2 in h2_cats:
         slug = slugify(h2['name_english'])
         translated = t(h2, 'name', lang)
@@ -608,60 +738,61 @@ def gen_going_further(categories, compounds, expressions, advanced, lang):
             toc_children.append((h3_slug, to_ruby_html(esc(h3_label))))
 
         toc.append((slug, to_ruby_html(esc(toc_label)), toc_children))
-        parts.append(f'  <h2 id="{slug}" class="section-heading">{h}</h2>\n')
+        buf.write(f'  <h2 id="{slug}" class="section-heading">{h}</h2>\n')
 
         desc_key = WB_DESC_KEYS.get(h2['name_english'], '')
         if desc_key:
             desc = ui(desc_key, lang)
-            parts.append(f'  <p>{desc}</p>\n')
+            buf.write(f'  <p>{desc}</p>\n')
             if desc_key == 'wb_desc_compounds':
                 warning = ui('wb_reading_warning', lang)
-                parts.append(f'  <p class="reading-warning">{warning}</p>\n')
+                buf.write(f'  <p class="reading-warning">{warning}</p>\n')
         else:
             h2_note = t(h2, 'note', lang)
             if h2_note:
-                parts.append(f'  <p>{to_ruby_html(esc(h2_note))}</p>\n')
-        parts.append('\n')
+                buf.write(f'  <p>{to_ruby_html(esc(h2_note))}</p>\n')
+        buf.write('\n')
 
         for h3 in children.get(h2['id'], []):
             h3_slug = slugify(h3['name_english'])
             h3_translated = t(h3, 'name', lang)
             h3_heading = bilingual(h3['name_minihongo'], h3_translated)
-            parts.append(f'  <h3 id="{h3_slug}">{h3_heading}</h3>\n')
+            buf.write(f'  <h3 id="{h3_slug}">{h3_heading}</h3>\n')
 
-            cat_compounds = by_sort(compounds_by_cat.get(h3['id'], []))
-            cat_expressions = by_sort(expressions_by_cat.get(h3['id'], []))
-            cat_advanced = by_sort(advanced_by_cat.get(h3['id'], []))
+            cat_compounds = idx.compounds_by_cat.get(h3['id'], [])
+            cat_expressions = idx.expressions_by_cat.get(h3['id'], [])
+            cat_advanced = idx.advanced_by_cat.get(h3['id'], [])
 
             if cat_compounds:
-                _render_compound_table(parts, cat_compounds, lang)
+                _render_compound_table(buf, cat_compounds, lang)
             elif cat_expressions:
                 has_japanese = any(e['japanese'] for e in cat_expressions)
                 if has_japanese:
-                    _render_common_table(parts, cat_expressions, lang)
+                    _render_common_table(buf, cat_expressions, lang)
                 else:
-                    _render_concept_table(parts, cat_expressions, lang)
+                    _render_concept_table(buf, cat_expressions, lang)
             elif cat_advanced:
-                _render_advanced_table(parts, cat_advanced, lang, mh_for_target)
+                _render_advanced_table(buf, cat_advanced, lang, idx.mh_for_target)
 
-            parts.append('\n')
+            buf.write('\n')
 
     immerse_heading = ui('gf_immerse_heading', lang)
     immerse_body = ui('gf_immerse_body', lang)
     toc.append((immerse_slug, immerse_heading))
-    parts.append(f'  <h2 id="{immerse_slug}" class="section-heading">{immerse_heading}</h2>\n')
-    parts.append(f'  <p>{immerse_body}</p>\n\n')
+    buf.write(f'  <h2 id="{immerse_slug}" class="section-heading">{immerse_heading}</h2>\n')
+    buf.write(f'  <p>{immerse_body}</p>\n\n')
 
-    return wrap_page('going-further', ''.join(parts), lang, toc, pre_toc=intro_html)
+    return wrap_page('going-further', buf.getvalue(), lang, render_toc(toc), pre_toc=intro_html)
 
 
-def _render_compound_table(parts, rows, lang):
+def _render_compound_table(buf, rows, lang):
     """2-col table: Word (with furigana) / Meaning."""
     th_word = ui('th_word', lang)
     th_meaning = ui('th_meaning', lang)
-    parts.append('  <div class="table-scroll"><table class="compound-table">\n')
-    parts.append(f'    <thead><tr><th lang="ja">{th_word}</th><th>{th_meaning}</th></tr></thead>\n')
-    parts.append('    <tbody>\n')
+    buf.write('  <div class="table-scroll"><table class="compound-table">\n')
+    buf.write(f'    <thead><tr><th lang="ja">{th_word}</th><th>{th_meaning}</th></tr></thead>\n')
+    buf.write('    <tbody>\n')
+    out = []
     for r in rows:
         word = f'<ruby>{r["minihongo"]}<rt>{r["reading"]}</rt></ruby>'
         if lang == 'mh':
@@ -671,119 +802,93 @@ def _render_compound_table(parts, rows, lang):
         else:
             meaning = render(t(r, "", lang))
         pb = play_btn('c', r.get('audio_file', ''))
-        parts.append(
-            f'      <tr>'
-            f'<td lang="ja">{pb}{word}</td>'
-            f'<td>{meaning}</td>'
-            f'</tr>\n'
-        )
-    parts.append('    </tbody>\n')
-    parts.append('  </table></div>\n')
+        out.append(_COMPOUND_ROW_TMPL.format_map({
+            'pb': pb, 'word': word, 'meaning': meaning,
+        }))
+    buf.write(''.join(out))
+    buf.write('    </tbody>\n')
+    buf.write('  </table></div>\n')
 
 
-def _render_common_table(parts, rows, lang):
+def _render_common_table(buf, rows, lang):
     """Common words table.
     For mh: 1-col, only minihongo expression.
     For en/ja: 2-col, Minihongo + English/Japanese meaning."""
     th_minihongo = ui('th_minihongo', lang)
-    parts.append('<div class="table-scroll"><table class="compound-table">\n')
+    buf.write('<div class="table-scroll"><table class="compound-table">\n')
     if lang == 'mh':
-        parts.append(f'  <thead><tr><th lang="ja">{th_minihongo}</th></tr></thead>\n')
+        buf.write(f'  <thead><tr><th lang="ja">{th_minihongo}</th></tr></thead>\n')
     else:
         th_meaning = ui('th_meaning', lang)
-        parts.append(f'  <thead><tr><th lang="ja">{th_minihongo}</th><th>{th_meaning}</th></tr></thead>\n')
-    parts.append('  <tbody>\n')
+        buf.write(f'  <thead><tr><th lang="ja">{th_minihongo}</th><th>{th_meaning}</th></tr></thead>\n')
+    buf.write('  <tbody>\n')
+    out = []
     for r in rows:
         mh = to_ruby_html(r['minihongo'])
         pb = play_btn('e', r.get('audio_file', ''))
         if lang == 'mh':
-            parts.append(f'    <tr><td lang="ja">{pb}{mh}</td></tr>\n')
+            out.append(f'    <tr><td lang="ja">{pb}{mh}</td></tr>\n')
         else:
             meaning = esc(r['japanese'] if lang == 'ja' else r['english'])
-            parts.append(
-                f'    <tr>'
-                f'<td lang="ja">{pb}{mh}</td>'
-                f'<td>{meaning}</td>'
-                f'</tr>\n'
-            )
-    parts.append('  </tbody>\n')
-    parts.append('</table></div>\n')
+            out.append(_COMMON_ROW_TMPL.format_map({
+                'pb': pb, 'mh': mh, 'meaning': meaning,
+            }))
+    buf.write(''.join(out))
+    buf.write('  </tbody>\n')
+    buf.write('</table></div>\n')
 
 
-def _render_concept_table(parts, rows, lang):
+def _render_concept_table(buf, rows, lang):
     """3-col table: Concept / Expression / Literally.
     For mh: 2-col, minihongo expression + definition."""
     if lang == 'mh':
         th_word = ui('th_word', lang)
         th_meaning = ui('th_meaning', lang)
         has_defs = any(r.get('definition_minihongo') for r in rows)
-        parts.append('  <div class="table-scroll"><table class="compound-table">\n')
+        buf.write('  <div class="table-scroll"><table class="compound-table">\n')
         if has_defs:
-            parts.append(f'    <thead><tr><th lang="ja">{th_word}</th><th>{th_meaning}</th></tr></thead>\n')
+            buf.write(f'    <thead><tr><th lang="ja">{th_word}</th><th>{th_meaning}</th></tr></thead>\n')
         else:
-            parts.append(f'    <thead><tr><th lang="ja">{th_word}</th></tr></thead>\n')
-        parts.append('    <tbody>\n')
+            buf.write(f'    <thead><tr><th lang="ja">{th_word}</th></tr></thead>\n')
+        buf.write('    <tbody>\n')
         for r in rows:
             mh = to_ruby_html(r['minihongo'])
             pb = play_btn('e', r.get('audio_file', ''))
             if has_defs:
                 defn = to_ruby_html(esc(r.get('definition_minihongo', '') or ''))
-                parts.append(f'      <tr><td lang="ja">{pb}{mh}</td><td>{defn}</td></tr>\n')
+                buf.write(f'      <tr><td lang="ja">{pb}{mh}</td><td>{defn}</td></tr>\n')
             else:
-                parts.append(f'      <tr><td lang="ja">{pb}{mh}</td></tr>\n')
-        parts.append('    </tbody>\n')
-        parts.append('  </table></div>\n')
+                buf.write(f'      <tr><td lang="ja">{pb}{mh}</td></tr>\n')
+        buf.write('    </tbody>\n')
+        buf.write('  </table></div>\n')
         return
 
     th_concept = ui('th_concept', lang)
     th_literally = ui('th_literally', lang)
-    parts.append('  <div class="table-scroll"><table class="compound-table">\n')
-    parts.append(f'    <thead><tr><th>{th_concept}</th><th lang="ja">\u8a00\u3044\u65b9</th><th>{th_literally}</th></tr></thead>\n')
-    parts.append('    <tbody>\n')
-    for r in rows:
-        mh = to_ruby_html(r['minihongo'])
-        pb = play_btn('e', r.get('audio_file', ''))
-        parts.append(
-            f'      <tr>'
-            f'<td>{esc(r["english"])}</td>'
-            f'<td lang="ja">{pb}{mh}</td>'
-            f'<td>{esc(r["english_litteral"])}</td>'
-            f'</tr>\n'
-        )
-    parts.append('    </tbody>\n')
-    parts.append('  </table></div>\n')
+    buf.write('  <div class="table-scroll"><table class="compound-table">\n')
+    buf.write(f'    <thead><tr><th>{th_concept}</th><th lang="ja">\u8a00\u3044\u65b9</th><th>{th_literally}</th></tr></thead>\n')
+    buf.write('    <tbody>\n')
+    buf.write(''.join(
+        _CONCEPT_ROW_TMPL.format_map({
+            'english': esc(r['english']),
+            'pb': play_btn('e', r.get('audio_file', '')),
+            'mh': to_ruby_html(r['minihongo']),
+            'literally': esc(r['english_litteral']),
+        })
+        for r in rows
+    ))
+    buf.write('    </tbody>\n')
+    buf.write('  </table></div>\n')
 
 
 # -- Reading ------------------------------------------------------------------
 
-def gen_reading(categories, haiku, dialog_groups, dialogs, stories, lang):
-    haiku_by_cat = defaultdict(list)
-    for h in haiku:
-        haiku_by_cat[h['category_id']].append(h)
-
-    dgrp_by_cat = defaultdict(list)
-    for dg in dialog_groups:
-        dgrp_by_cat[dg['category_id']].append(dg)
-
-    dlg_by_grp = defaultdict(list)
-    for d in dialogs:
-        dlg_by_grp[d['dialog_group_id']].append(d)
-
-    stories_by_cat = defaultdict(list)
-    for s in stories:
-        stories_by_cat[s['category_id']].append(s)
-
-    h2_cats = by_sort([c for c in categories
-                       if c['page_id'] == 'reading' and not c['parent_id']])
-    children = defaultdict(list)
-    for c in categories:
-        if c['page_id'] == 'reading' and c['parent_id']:
-            children[c['parent_id']].append(c)
-    for k in children:
-        children[k] = by_sort(children[k])
+def gen_reading(idx, lang):
+    h2_cats = idx.h2_by_page.get('reading', [])
+    children = idx.children_by_parent
 
     toc = []
-    parts = []
+    buf = io.StringIO()
     for h2 in h2_cats:
         slug = slugify(h2['name_english'])
         translated = t(h2, 'name', lang)
@@ -797,92 +902,93 @@ def gen_reading(categories, haiku, dialog_groups, dialogs, stories, lang):
             toc_children.append((ch_slug, to_ruby_html(esc(ch_label))))
 
         toc.append((slug, to_ruby_html(esc(toc_label)), toc_children))
-        parts.append(f'  <h2 id="{slug}" class="section-heading">{h}</h2>\n')
-        parts.append('\n')
+        buf.write(f'  <h2 id="{slug}" class="section-heading">{h}</h2>\n')
+        buf.write('\n')
 
         for cat in children.get(h2['id'], [h2]):
             if children.get(h2['id']):
                 sub_slug = slugify(cat['name_english'])
                 sub_translated = t(cat, 'name', lang)
                 sub_h = bilingual(cat['name_minihongo'], sub_translated)
-                parts.append(f'<h3 id="{sub_slug}" class="section-heading">{sub_h}</h3>\n')
+                buf.write(f'<h3 id="{sub_slug}" class="section-heading">{sub_h}</h3>\n')
 
             # Haiku
-            for hk in by_sort(haiku_by_cat.get(cat['id'], [])):
+            for hk in idx.haiku_by_cat.get(cat['id'], []):
                 mh = to_ruby_html(hk['minihongo']).replace(' / ', '<br>')
                 pb = play_btn('h', hk.get('audio_file', ''))
-                parts.append('  <div class="haiku">\n')
-                parts.append(f'    <p lang="ja">{mh}</p>\n')
+                buf.write('  <div class="haiku">\n')
+                buf.write(f'    <p lang="ja">{mh}</p>\n')
                 if lang != 'mh':
                     translated_hk = to_ruby_html(t(hk, '', lang))
-                    parts.append(f'    <p>{translated_hk}</p>\n')
+                    buf.write(f'    <p>{translated_hk}</p>\n')
                 if pb:
-                    parts.append(f'    {pb}\n')
-                parts.append('  </div>\n')
-                parts.append('\n')
+                    buf.write(f'    {pb}\n')
+                buf.write('  </div>\n')
+                buf.write('\n')
 
             # Dialog groups
-            for dg in by_sort(dgrp_by_cat.get(cat['id'], [])):
+            for dg in idx.dgrp_by_cat.get(cat['id'], []):
                 dg_translated = t(dg, 'title', lang)
                 title = to_ruby_html(bilingual(dg['title_minihongo'], dg_translated))
-                lines = sorted(dlg_by_grp.get(dg['id'], []),
-                              key=lambda d: int(d['line_number']))
+                lines = idx.dlg_by_grp.get(dg['id'], [])
 
                 pb = play_btn('d', dg.get('audio_file', ''))
-                parts.append(f'<h4 id="{slugify(dg["title_english"])}">{title} {pb}</h4>\n')
-                parts.append(f'<details class="reading-text" open><summary>{ui("show_text", lang)}</summary>\n')
-                parts.append('<div class="dialog">\n')
+                buf.write(f'<h4 id="{slugify(dg["title_english"])}">{title} {pb}</h4>\n')
+                buf.write(f'<details class="reading-text" open><summary>{ui("show_text", lang)}</summary>\n')
+                # Dialog and its translation in one pass over the lines
+                trans_buf = io.StringIO() if lang != 'mh' else None
+                buf.write('<div class="dialog">\n')
                 for ln in lines:
                     speaker = to_ruby_html(ln['speaker_minihongo'])
                     body = to_ruby_html(ln['minihongo'])
-                    parts.append(f'  <p lang="ja"><strong>{speaker}:</strong> {body}</p>\n')
-                parts.append('</div>\n')
-                if lang != 'mh':
-                    parts.append('<div class="dialog-translation">\n')
-                    for ln in lines:
-                        speaker = to_ruby_html(t(ln, 'speaker', lang))
-                        body = to_ruby_html(t(ln, '', lang))
-                        parts.append(f'  <p><strong>{speaker}:</strong> {body}</p>\n')
-                    parts.append('</div>\n')
-                parts.append('</details>\n')
-                parts.append('\n')
+                    buf.write(f'  <p lang="ja"><strong>{speaker}:</strong> {body}</p>\n')
+                    if trans_buf is not None:
+                        tr_speaker = to_ruby_html(t(ln, 'speaker', lang))
+                        tr_body = to_ruby_html(t(ln, '', lang))
+                        trans_buf.write(f'  <p><strong>{tr_speaker}:</strong> {tr_body}</p>\n')
+                buf.write('</div>\n')
+                if trans_buf is not None:
+                    buf.write('<div class="dialog-translation">\n')
+                    buf.write(trans_buf.getvalue())
+                    buf.write('</div>\n')
+                buf.write('</details>\n')
+                buf.write('\n')
 
             # Stories
-            for st in by_sort(stories_by_cat.get(cat['id'], [])):
+            for st in idx.stories_by_cat.get(cat['id'], []):
                 st_slug = slugify(st.get('title_english') or st['id'])
                 st_translated = t(st, 'title', lang)
                 title = to_ruby_html(bilingual(st['title_minihongo'], st_translated))
 
                 mh_text = st['minihongo']
-                mh_paras = re.split(r'(?<=[\u3002\u300d]) ', mh_text)
-                mh_paras = [p for p in mh_paras if p.strip()]
+                mh_paras = [p for p in _split_story(mh_text) if p.strip()]
 
                 pb = play_btn('s', st.get('audio_file', ''))
-                parts.append(f'<h4 id="{st_slug}">{title} {pb}</h4>\n')
-                parts.append(f'<details class="reading-text" open><summary>{ui("show_text", lang)}</summary>\n')
-                parts.append('<div class="story">\n')
+                buf.write(f'<h4 id="{st_slug}">{title} {pb}</h4>\n')
+                buf.write(f'<details class="reading-text" open><summary>{ui("show_text", lang)}</summary>\n')
+                buf.write('<div class="story">\n')
                 for para in mh_paras:
-                    parts.append(f'  <p lang="ja">{to_ruby_html(para)}</p>\n')
-                parts.append('</div>\n')
+                    buf.write(f'  <p lang="ja">{to_ruby_html(para)}</p>\n')
+                buf.write('</div>\n')
                 if lang != 'mh':
                     translated_story = to_ruby_html(t(st, '', lang))
-                    parts.append('<div class="story-translation">\n')
-                    parts.append(f'  <p>{translated_story}</p>\n')
-                    parts.append('</div>\n')
-                parts.append('</details>\n')
-                parts.append('\n')
+                    buf.write('<div class="story-translation">\n')
+                    buf.write(f'  <p>{translated_story}</p>\n')
+                    buf.write('</div>\n')
+                buf.write('</details>\n')
+                buf.write('\n')
 
     listen_toggle = (
         f'  <p><button class="nav-toggle listen-toggle" id="btn-listen">'
         f'{ui("listen_first", lang)}</button></p>\n\n'
     )
-    return wrap_page('reading', ''.join(parts), lang, toc, pre_toc=listen_toggle)
+    return wrap_page('reading', buf.getvalue(), lang, render_toc(toc), pre_toc=listen_toggle)
 
 
 # -- Practice -----------------------------------------------------------------
 
 def _plain_mh(text):
-    return re.sub(r'【[^】]+】', '', text)
+    return _FURIGANA_RE.sub('', text)
 
 
 def _cloze(text_mh, blankable, used):
@@ -923,71 +1029,55 @@ def _quiz_item_html(question_mh, options, full_mh, translation):
     )
 
 
-def gen_practice(candos, dialog_groups, dialogs, words, grammar, grammar_examples, lang):
-    dg_by_id = {d['id']: d for d in dialog_groups}
-    lines_by_grp = defaultdict(list)
-    for d in dialogs:
-        lines_by_grp[d['dialog_group_id']].append(d)
-
-    words_by_cat = defaultdict(list)
-    for w in words:
-        words_by_cat[w['category_id']].append(w)
-    for k in words_by_cat:
-        words_by_cat[k] = by_sort(words_by_cat[k])
-
-    # Longest words first so the cloze blanks the most specific match
-    blankable = sorted(
-        [w for w in words if '【' in w['minihongo']],
-        key=lambda w: len(_plain_mh(w['minihongo'])),
-        reverse=True,
-    )
-
+def gen_practice(candos, words, grammar, idx, lang):
     trans_col = {'en': 'english', 'ja': 'japanese', 'mh': ''}[lang]
 
     toc = []
-    parts = []
-    parts.append(f'  <p>{ui("practice_intro", lang)}</p>\n\n')
+    buf = io.StringIO()
+    buf.write(f'  <p>{ui("practice_intro", lang)}</p>\n\n')
+
+    candos_sorted = by_sort(candos)
+    see_dialog = ui('practice_see_dialog', lang)
 
     # Can-do checklist
     toc.append(('can-do', ui('practice_cando_heading', lang), []))
-    parts.append(f'  <h2 id="can-do" class="section-heading">{ui("practice_cando_heading", lang)}</h2>\n')
-    parts.append(f'  <p class="cando-hint">{ui("practice_cando_hint", lang)}</p>\n')
-    parts.append('  <div class="cando-list">\n')
-    for c in by_sort(candos):
+    buf.write(f'  <h2 id="can-do" class="section-heading">{ui("practice_cando_heading", lang)}</h2>\n')
+    buf.write(f'  <p class="cando-hint">{ui("practice_cando_hint", lang)}</p>\n')
+    buf.write('  <div class="cando-list">\n')
+    for c in candos_sorted:
         trans = ''
         if trans_col:
             trans = f' <span class="cando-trans">{esc(c[trans_col])}</span>'
         link = ''
-        dg = dg_by_id.get(c['dialog_group_id'])
+        dg = idx.dg_by_id.get(c['dialog_group_id'])
         if dg:
             dg_slug = slugify(dg['title_english'])
             link = (f' <a class="cando-link" href="lessons/texts-dialogs.html#{dg_slug}">'
-                    f'{ui("practice_see_dialog", lang)}</a>')
-        parts.append(
+                    f'{see_dialog}</a>')
+        buf.write(
             f'    <label class="cando"><input type="checkbox" class="cando-check" '
             f'data-id="{c["id"]}"> <span lang="ja">{to_ruby_html(c["minihongo"])}</span>'
             f'{trans}{link}</label>\n'
         )
-    parts.append('  </div>\n\n')
+    buf.write('  </div>\n\n')
 
     # Quiz: cloze items from each can-do's dialog
     toc.append(('quiz', ui('practice_quiz_heading', lang), []))
-    parts.append(f'  <h2 id="quiz" class="section-heading">{ui("practice_quiz_heading", lang)}</h2>\n')
-    for c in by_sort(candos):
-        dg = dg_by_id.get(c['dialog_group_id'])
+    buf.write(f'  <h2 id="quiz" class="section-heading">{ui("practice_quiz_heading", lang)}</h2>\n')
+    for c in candos_sorted:
+        dg = idx.dg_by_id.get(c['dialog_group_id'])
         if not dg:
             continue
         items = []
         used = set()
-        for ln in sorted(lines_by_grp.get(dg['id'], []),
-                         key=lambda d: int(d['line_number'])):
-            question, answer = _cloze(ln['minihongo'], blankable, used)
+        for ln in idx.dlg_by_grp.get(dg['id'], []):
+            question, answer = _cloze(ln['minihongo'], idx.blankable, used)
             if not answer:
                 continue
             used.add(answer['id'])
-            pool = words_by_cat.get(answer['category_id'], [])
+            pool = idx.words_by_cat.get(answer['category_id'], [])
             if len(pool) < 4:
-                pool = blankable
+                pool = idx.blankable
             options = _quiz_options(answer, pool, f'{c["id"]}-{ln["id"]}')
             translation = ln.get(trans_col, '') if trans_col else ''
             items.append(_quiz_item_html(question, options, ln['minihongo'], translation))
@@ -996,38 +1086,35 @@ def gen_practice(candos, dialog_groups, dialogs, words, grammar, grammar_example
         if not items:
             continue
         title = to_ruby_html(bilingual(dg['title_minihongo'], t(dg, 'title', lang)))
-        parts.append(f'  <section class="quiz-section" data-cando="{c["id"]}" data-total="{len(items)}">\n')
-        parts.append(f'    <h3>{title}</h3>\n')
-        parts.extend(items)
-        parts.append('  </section>\n')
+        buf.write(f'  <section class="quiz-section" data-cando="{c["id"]}" data-total="{len(items)}">\n')
+        buf.write(f'    <h3>{title}</h3>\n')
+        buf.writelines(items)
+        buf.write('  </section>\n')
 
     # Grammar quiz: one cloze per core grammar point
-    ex_by_gram = defaultdict(list)
-    for ex in grammar_examples:
-        ex_by_gram[ex['grammar_id']].append(ex)
     g_items = []
     for g in by_sort([g for g in grammar if g.get('core') == 'yes']):
-        for ex in by_sort(ex_by_gram.get(g['id'], [])):
-            question, answer = _cloze(ex['minihongo'], blankable, set())
+        for ex in idx.ex_by_gram.get(g['id'], []):
+            question, answer = _cloze(ex['minihongo'], idx.blankable, set())
             if not answer:
                 continue
-            pool = words_by_cat.get(answer['category_id'], [])
+            pool = idx.words_by_cat.get(answer['category_id'], [])
             if len(pool) < 4:
-                pool = blankable
+                pool = idx.blankable
             options = _quiz_options(answer, pool, f'gram-{ex["id"]}')
             translation = ex.get(trans_col, '') if trans_col else ''
             g_items.append(_quiz_item_html(question, options, ex['minihongo'], translation))
             break
     if g_items:
-        parts.append(f'  <section class="quiz-section" data-cando="grammar" data-total="{len(g_items)}">\n')
-        parts.append(f'    <h3>{ui("practice_quiz_grammar", lang)}</h3>\n')
-        parts.extend(g_items)
-        parts.append('  </section>\n')
+        buf.write(f'  <section class="quiz-section" data-cando="grammar" data-total="{len(g_items)}">\n')
+        buf.write(f'    <h3>{ui("practice_quiz_grammar", lang)}</h3>\n')
+        buf.writelines(g_items)
+        buf.write('  </section>\n')
 
     # AI conversation partner: copyable prompt, word list interpolated from words.csv
     toc.append(('ai-partner', ui('practice_ai_heading', lang), []))
-    parts.append(f'  <h2 id="ai-partner" class="section-heading">{ui("practice_ai_heading", lang)}</h2>\n')
-    parts.append(f'  <p>{ui("practice_ai_body", lang)}</p>\n')
+    buf.write(f'  <h2 id="ai-partner" class="section-heading">{ui("practice_ai_heading", lang)}</h2>\n')
+    buf.write(f'  <p>{ui("practice_ai_body", lang)}</p>\n')
     word_list = ', '.join(f'{w["minihongo"]} ({w["english"]})' for w in by_sort(words))
     prompt = (
         'You are my Japanese conversation partner for Minihongo practice.\n'
@@ -1046,27 +1133,22 @@ def gen_practice(candos, dialog_groups, dialogs, words, grammar, grammar_example
         '\n'
         f'The {len(words)} words: {word_list}'
     )
-    parts.append('  <details class="ai-prompt-box">\n')
-    parts.append(f'    <summary>{ui("practice_ai_show", lang)}</summary>\n')
-    parts.append(f'    <pre id="ai-prompt">{esc(prompt)}</pre>\n')
-    parts.append('  </details>\n')
-    parts.append(
+    buf.write('  <details class="ai-prompt-box">\n')
+    buf.write(f'    <summary>{ui("practice_ai_show", lang)}</summary>\n')
+    buf.write(f'    <pre id="ai-prompt">{esc(prompt)}</pre>\n')
+    buf.write('  </details>\n')
+    buf.write(
         f'  <button id="copy-prompt" data-copied="{strip_html(ui("practice_ai_copied", lang))}">'
         f'{ui("practice_ai_copy", lang)}</button>\n'
     )
 
-    return wrap_page('practice', ''.join(parts), lang, toc)
+    return wrap_page('practice', buf.getvalue(), lang, render_toc(toc))
 
 
 # -- Understanding Japan page ---------------------------------------------------
 
-def gen_understanding(categories, comprehension, lang):
-    items_by_cat = defaultdict(list)
-    for r in comprehension:
-        items_by_cat[r['category_id']].append(r)
-
-    cats = by_sort([c for c in categories
-                    if c['page_id'] == 'understanding' and not c['parent_id']])
+def gen_understanding(idx, lang):
+    cats = idx.h2_by_page.get('understanding', [])
 
     intro_html = (
         f'  <p>{ui("understanding_intro", lang)}</p>\n'
@@ -1079,33 +1161,33 @@ def gen_understanding(categories, comprehension, lang):
     th_where = ui('th_where', lang)
 
     toc = []
-    parts = []
+    buf = io.StringIO()
     for cat in cats:
         slug = slugify(cat['name_english'])
         translated = t(cat, 'name', lang)
         toc.append((slug, to_ruby_html(esc(translated or cat['name_english']))))
         heading = bilingual(cat['name_minihongo'], translated)
-        parts.append(f'  <h2 id="{slug}" class="section-heading">{heading}</h2>\n')
+        buf.write(f'  <h2 id="{slug}" class="section-heading">{heading}</h2>\n')
 
         note = t(cat, 'note', lang)
         if note:
-            parts.append(f'  <p class="category-note">{to_ruby_html(esc(note))}</p>\n')
+            buf.write(f'  <p class="category-note">{to_ruby_html(esc(note))}</p>\n')
 
-        parts.append('  <div class="table-scroll"><table class="compound-table">\n')
+        buf.write('  <div class="table-scroll"><table class="compound-table">\n')
         if lang == 'en':
-            parts.append(f'    <thead><tr><th lang="ja">{th_jp}</th><th>{th_en}</th>'
+            buf.write(f'    <thead><tr><th lang="ja">{th_jp}</th><th>{th_en}</th>'
                          f'<th lang="ja">{th_gloss}</th><th>{th_where}</th></tr></thead>\n')
         elif lang == 'ja':
-            parts.append(f'    <thead><tr><th lang="ja">{th_jp}</th>'
+            buf.write(f'    <thead><tr><th lang="ja">{th_jp}</th>'
                          f'<th lang="ja">{th_gloss}</th><th lang="ja">{th_where}</th></tr></thead>\n')
         else:
-            parts.append(f'    <thead><tr><th lang="ja">{th_jp}</th>'
+            buf.write(f'    <thead><tr><th lang="ja">{th_jp}</th>'
                          f'<th lang="ja">{th_gloss}</th></tr></thead>\n')
-        parts.append('    <tbody>\n')
+        buf.write('    <tbody>\n')
 
         # Real-Japanese rows: explicit columns only. t() would fall back to
         # the japanese column, i.e. return the item itself as its ja meaning.
-        for r in by_sort(items_by_cat.get(cat['id'], [])):
+        for r in idx.items_by_cat.get(cat['id'], []):
             pb = play_btn('u', r.get('audio_file', ''))
             jp = render(r['japanese'])
             gloss = render(r['minihongo'])
@@ -1117,12 +1199,12 @@ def gen_understanding(categories, comprehension, lang):
                          f'<td lang="ja">{esc(r["where_japanese"])}</td>')
             else:
                 cells = f'<td lang="ja">{pb}{jp}</td><td lang="ja">{gloss}</td>'
-            parts.append(f'      <tr>{cells}</tr>\n')
+            buf.write(f'      <tr>{cells}</tr>\n')
 
-        parts.append('    </tbody>\n')
-        parts.append('  </table></div>\n\n')
+        buf.write('    </tbody>\n')
+        buf.write('  </table></div>\n\n')
 
-    return wrap_page('understanding', ''.join(parts), lang, toc, pre_toc=intro_html)
+    return wrap_page('understanding', buf.getvalue(), lang, render_toc(toc), pre_toc=intro_html)
 
 
 # -- Main ---------------------------------------------------------------------
@@ -1166,35 +1248,96 @@ def main():
     comprehension = load_csv('comprehension')
     advanced = load_csv('advanced')
 
+    idx = build_indexes(categories, words, grammar, grammar_examples,
+                        compounds, expressions, advanced, haiku,
+                        dialog_groups, dialogs_data, stories, comprehension)
+
+    # Skip languages whose outputs were already built from these exact
+    # sources; everything flows from the scripts and the CSVs, so one
+    # digest over them decides freshness for the whole language.
+    digest = _source_digest()
+    try:
+        cache = json.loads(BUILD_CACHE.read_text())
+    except (OSError, ValueError):
+        cache = {}
+    stale = [lang for lang in LANGS if not _lang_up_to_date(lang, digest, cache)]
     for lang in LANGS:
-        if lang == 'en':
-            out_dir = PAGES_OUT / 'lessons'
-            index_path = PAGES_OUT / 'index.html'
-        else:
-            out_dir = PAGES_OUT / lang / 'lessons'
-            index_path = PAGES_OUT / lang / 'index.html'
-
-        out_dir.mkdir(parents=True, exist_ok=True)
-
-        # Homepage
-        index_path.write_text(gen_index(lang))
-        print(f'  {index_path}')
-
-        # Lesson pages
-        pages = [
-            ('vocabulary', gen_vocabulary(categories, words, lang)),
-            ('grammar', gen_grammar(categories, grammar, grammar_examples, lang)),
-            ('word-building', gen_word_building(categories, compounds, expressions, lang)),
-            ('going-further', gen_going_further(categories, compounds, expressions, advanced, lang)),
-            ('reading', gen_reading(categories, haiku, dialog_groups, dialogs_data, stories, lang)),
-            ('practice', gen_practice(candos, dialog_groups, dialogs_data, words, grammar, grammar_examples, lang)),
-            ('understanding', gen_understanding(categories, comprehension, lang)),
-        ]
-
-        for page_id, html in pages:
-            path = out_dir / PAGE_FILES[page_id]
-            path.write_text(html)
-            print(f'  {path}')
+        if lang not in stale:
+            print(f'  {lang}: up to date')
+
+    # The language passes share no mutable state, so run them in worker
+    # processes. The initializer reloads the small UI/pages tables so the
+    # pool also works under spawn/forkserver start methods, where module
+    # globals are not inherited from the parent.
+    if stale:
+        with ProcessPoolExecutor(max_workers=len(stale),
+                                 initializer=_init_language_worker) as ex:
+            futures = [
+                ex.submit(generate_language, lang, idx, words, grammar, candos)
+                for lang in stale
+            ]
+            for f in futures:
+                f.result()
+
+    PAGES_OUT.mkdir(parents=True, exist_ok=True)
+    BUILD_CACHE.write_text(json.dumps({lang: digest for lang in LANGS}, indent=2) + '\n')
+
+
+def _init_language_worker():
+    load_ui_strings()
+    load_page_data()
+
+
+def _lang_paths(lang):
+    """Output directory and homepage path for a language."""
+    base = PAGES_OUT if lang == 'en' else PAGES_OUT / lang
+    return base / 'lessons', base / 'index.html'
+
+
+def _source_digest():
+    """Digest of everything the pages depend on: scripts and data CSVs."""
+    h = hashlib.sha256()
+    for f in [Path(__file__), Path(__file__).parent / 'mh_common.py',
+              *sorted(DATA.glob('*.csv'))]:
+        h.update(f.read_bytes())
+    return h.hexdigest()
+
+
+def _lang_up_to_date(lang, digest, cache):
+    """True if a language's outputs were built from the current sources."""
+    if cache.get(lang) != digest:
+        return False
+    out_dir, index_path = _lang_paths(lang)
+    outputs = [index_path] + [out_dir / f for f in PAGE_FILES.values()]
+    return all(f.exists() for f in outputs)
+
+
+def generate_language(lang, idx, words, grammar, candos):
+    """Generate the homepage and all lesson pages for one language."""
+    out_dir, index_path = _lang_paths(lang)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    # Yield each page as it is produced: the writer pool flushes it to disk
+    # while the next one is still being generated, so at most a couple of
+    # pages sit in memory at once instead of all eight.
+    def produce():
+        yield index_path, gen_index(lang)
+        yield out_dir / PAGE_FILES['vocabulary'], gen_vocabulary(idx, lang)
+        yield out_dir / PAGE_FILES['grammar'], gen_grammar(idx, lang)
+        yield out_dir / PAGE_FILES['word-building'], gen_word_building(idx, lang)
+        yield out_dir / PAGE_FILES['going-further'], gen_going_further(idx, lang)
+        yield out_dir / PAGE_FILES['reading'], gen_reading(idx, lang)
+        yield out_dir / PAGE_FILES['practice'], gen_practice(candos, words, grammar, idx, lang)
+        yield out_dir / PAGE_FILES['understanding'], gen_understanding(idx, lang)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(_write_page, produce()))
+
+
+def _write_page(output):
+    path, html = output
+    path.write_text(html)
+    print(f'  {path}')
 
 
 if __name__ == '__main__':
@@ -8,6 +8,7 @@ import re
 import subprocess
 import sys
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from mh_common import LANGS, LANG_COL, load_csv, strip_furigana
@@ -97,22 +98,16 @@ def cat_name(cat, lang):
     return f'{mh} ({translated})'
 
 
+# Characters that are special in Typst markup, as a translate table so esc()
+# walks each string once instead of ten chained .replace() passes.
+_TYPST_ESC = str.maketrans({c: '\\' + c for c in '\\#$@<>*_`"'})
+
+
 def esc(text):
     """Escape Typst special characters."""
     if not text:
         return ''
-    # Escape characters that are special in Typst markup
-    text = text.replace('\\', '\\\\')
-    text = text.replace('#', '\\#')
-    text = text.replace('$', '\\$')
-    text = text.replace('@', '\\@')
-    text = text.replace('<', '\\<')
-    text = text.replace('>', '\\>')
-    text = text.replace('*', '\\*')
-    text = text.replace('_', '\\_')
-    text = text.replace('`', '\\`')
-    text = text.replace('"', '\\"')
-    return text
+    return text.translate(_TYPST_ESC)
 
 
 def to_ruby(text):
@@ -654,22 +649,30 @@ def main():
 
     langs = [args['lang']] if args['lang'] else LANGS
 
-    ok = True
-    for lang in langs:
-        typ_path = generate_lang(lang, *data_args, print_mode=print_mode, word_building=args['word_building'])
+    typ_paths = {
+        lang: generate_lang(lang, *data_args, print_mode=print_mode, word_building=args['word_building'])
+        for lang in langs
+    }
+
+    def compile_lang(lang):
+        """Compile one language: interior PDF, then its cover in print mode."""
         if print_mode:
             pdf_path = Path(f'minihongo-{lang}-interior.pdf')
         else:
             pdf_path = Path(f'minihongo-{lang}.pdf')
-        if not compile_typst(typ_path, pdf_path):
-            ok = False
-            continue
-
-        # In print mode, also generate wraparound cover (back + spine + front)
+        if not compile_typst(typ_paths[lang], pdf_path):
+            return False
+        # In print mode, also generate wraparound cover (back + spine + front);
+        # it needs the interior's page count, so it stays chained per language.
         if print_mode:
             page_count = get_page_count(pdf_path)
-            if not compile_cover(lang, page_count, spine_override=args['spine']):
-                ok = False
+            return compile_cover(lang, page_count, spine_override=args['spine'])
+        return True
+
+    # The languages are independent and the work happens in typst
+    # subprocesses, so compile them in parallel rather than one at a time.
+    with ThreadPoolExecutor(max_workers=len(langs)) as ex:
+        ok = all(list(ex.map(compile_lang, langs)))
 
     if not ok:
         sys.exit(1)
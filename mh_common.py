@@ -18,10 +18,27 @@ LANG_COL = {'en': 'english', 'ja': 'japanese', 'mh': 'minihongo'}
 _FURIGANA_RE = re.compile(r'【[^】]+】')
 
 
+# Columns parsed to int at load so sort keys don't re-run int() per row per
+# sort. Callers that still wrap them in int() keep working: int(5) == int('5').
+_INT_COLS = ('sort_order', 'line_number')
+
+
 def load_csv(name):
-    """Read data/{name}.csv into a list of dicts."""
+    """Read data/{name}.csv into a list of dicts. sort_order/line_number are ints."""
     with open(DATA / f'{name}.csv', newline='', encoding='utf-8') as f:
-        return list(csv.DictReader(f))
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return []
+        # dict(zip(...)) over the plain reader skips DictReader's per-row
+        # Python-level restkey/restval bookkeeping; DictReader also skipped
+        # blank rows, so keep doing that
+        rows = [dict(zip(header, row)) for row in reader if row]
+    for col in _INT_COLS:
+        if col in header:
+            for r in rows:
+                r[col] = int(r[col])
+    return rows
 
 
 def strip_furigana(text):
@@ -13,12 +13,14 @@ Usage: python site/build.py
 
 import csv
 import hashlib
+import mmap
 import os
 import re
 import shutil
 import subprocess
 import sys
 import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
@@ -228,13 +230,22 @@ def _parse_attrs(attrs_str):
     return dict(re.findall(r'([\w-]+)="([^"]*)"', attrs_str))
 
 
+_NAMED_SLOT_RE = re.compile(r'<(\w+)\s+slot="([^"]+)"[^>]*>(.*?)</\1>', re.DOTALL)
+
+
 def extract_slots(inner_html):
     """Parse slotted content from inside a component usage."""
     slots = {}
-    named_re = re.compile(r'<(\w+)\s+slot="([^"]+)"[^>]*>(.*?)</\1>', re.DOTALL)
-    for m in named_re.finditer(inner_html):
+    # One finditer pass collects the named slots and the default-slot pieces
+    # between them, instead of a second sub() pass over the same string.
+    rest = []
+    last = 0
+    for m in _NAMED_SLOT_RE.finditer(inner_html):
         slots[m.group(2)] = m.group(3).strip()
-    default = named_re.sub("", inner_html).strip()
+        rest.append(inner_html[last:m.start()])
+        last = m.end()
+    rest.append(inner_html[last:])
+    default = ''.join(rest).strip()
     if default:
         slots[""] = default
     return slots
@@ -255,73 +266,100 @@ def fill_slots(template, slots):
     return out
 
 
-def expand(html, components):
-    """Expand custom element tags inside-out (innermost first).
+_TAG_TOKEN_RE = re.compile(r'<(/?)([a-zA-Z][\w-]*)([^>]*)>')
 
-    Supports:
-    - Slot filling: <slot name="x"> replaced by <div slot="x">content</div>
-    - Props: HTML attributes become {{prop}} substitutions in the component
-    """
-    comp_names = "|".join(re.escape(n) for n in components)
-    if not comp_names:
-        return html
 
-    inner_re = re.compile(
-        rf"<({comp_names})([^>]*)>((?:(?!<(?:{comp_names})[\s>]).)*)</\1>",
-        re.DOTALL,
-    )
+def _innermost_usages(html, components):
+    """Locate innermost component usages in one linear pass over the tags.
 
-    while True:
-        m = inner_re.search(html)
-        if not m:
-            break
-        tag = m.group(1)
-        attrs_str = m.group(2)
-        inner = m.group(3)
+    Returns (start, end, tag, attrs_str, inner) tuples for every usage whose
+    body contains no other component - the ones safe to expand first.
+    """
+    found = []
+    stack = []  # [tag, start, content_start, attrs_str, has_child]
+    for m in _TAG_TOKEN_RE.finditer(html):
+        tag = m.group(2)
+        if tag not in components:
+            continue
+        if not m.group(1):
+            if stack:
+                stack[-1][4] = True
+            stack.append([tag, m.start(), m.end(), m.group(3), False])
+        elif stack and stack[-1][0] == tag:
+            _, start, content_start, attrs_str, has_child = stack.pop()
+            if not has_child:
+                found.append(
+                    (start, m.end(), tag, attrs_str, html[content_start:m.start()])
+                )
+    return found
 
-        template = components[tag]
 
-        # Prop substitution: HTML attributes -> {{prop}} in component template
-        props = _parse_attrs(attrs_str)
-        for key, val in props.items():
-            if key in ('class', 'id', 'style', 'lang'):
-                continue
-            template = re.sub(
-                r'\{\{\s*' + re.escape(key) + r'\s*\}\}',
-                val, template,
-            )
+def _fill_component(template, attrs_str, inner):
+    """Instantiate one component usage: props, slots, id/class forwarding."""
+    # Prop substitution: HTML attributes -> {{prop}} in component template
+    props = _parse_attrs(attrs_str)
+    for key, val in props.items():
+        if key in ('class', 'id', 'style', 'lang'):
+            continue
+        template = re.sub(
+            r'\{\{\s*' + re.escape(key) + r'\s*\}\}',
+            val, template,
+        )
 
-        slots = extract_slots(inner)
-        filled = fill_slots(template, slots)
+    filled = fill_slots(template, extract_slots(inner))
 
-        # Forward id/class from custom element to component root element
-        if 'id' in props:
+    # Forward id/class from custom element to component root element
+    if 'id' in props:
+        filled = re.sub(
+            r'^(\s*<\w+)',
+            rf'\1 id="{props["id"]}"',
+            filled,
+            count=1,
+        )
+    if 'class' in props:
+        # Merge into existing class attribute if present
+        if re.search(r'^(\s*<\w+[^>]*)\bclass="', filled):
+            filled = re.sub(
+                r'^(\s*<\w+[^>]*\bclass="[^"]*)',
+                rf'\1 {props["class"]}',
+                filled,
+                count=1,
+            )
+        else:
             filled = re.sub(
                 r'^(\s*<\w+)',
-                rf'\1 id="{props["id"]}"',
+                rf'\1 class="{props["class"]}"',
                 filled,
                 count=1,
             )
-        if 'class' in props:
-            # Merge into existing class attribute if present
-            if re.search(r'^(\s*<\w+[^>]*)\bclass="', filled):
-                filled = re.sub(
-                    r'^(\s*<\w+[^>]*\bclass="[^"]*)',
-                    rf'\1 {props["class"]}',
-                    filled,
-                    count=1,
-                )
-            else:
-                filled = re.sub(
-                    r'^(\s*<\w+)',
-                    rf'\1 class="{props["class"]}"',
-                    filled,
-                    count=1,
-                )
 
-        html = html[:m.start()] + filled + html[m.end():]
+    return filled
 
-    return html
+
+def expand(html, components):
+    """Expand custom element tags inside-out (innermost first).
+
+    Supports:
+    - Slot filling: <slot name="x"> replaced by <div slot="x">content</div>
+    - Props: HTML attributes become {{prop}} substitutions in the component
+    """
+    if not any(f'<{n}' in html for n in components):
+        return html
+
+    # Tokenize tags, expand every innermost usage, splice once per pass;
+    # repeat per nesting level. No backtracking regex over page bodies.
+    while True:
+        usages = _innermost_usages(html, components)
+        if not usages:
+            return html
+        out = []
+        last = 0
+        for start, end, tag, attrs_str, inner in usages:
+            out.append(html[last:start])
+            out.append(_fill_component(components[tag], attrs_str, inner))
+            last = end
+        out.append(html[last:])
+        html = ''.join(out)
 
 
 def resolve_includes(html):
@@ -337,8 +375,13 @@ def resolve_includes(html):
 
 def extract_fragment(html):
     """Pull out <main id="content">...</main> for SPA navigation."""
-    m = re.search(r'<main\s+id="content"[^>]*>.*?</main>', html, re.DOTALL)
-    return m.group(0) if m else html
+    start = html.find('<main id="content"')
+    if start < 0:
+        return html
+    end = html.find('</main>', start)
+    if end < 0:
+        return html
+    return html[start:end + len('</main>')]
 
 
 # ── Build ──────────────────────────────────────────────────────────
@@ -437,56 +480,61 @@ def _build_to(OUT, base_url):
     css_path = STATIC / 'style.css'
     inline_css = css_path.read_text() if css_path.exists() else ''
 
-    loader = lambda path: (TEMPLATES / path).read_text()
-    engine = Engine(loader=loader)
-    components = load_components()
-    data = load_all_data()
-    ui_strings = load_ui_strings(data)
-    page_id_map = build_page_id_map(data)
-    print(f"components: {', '.join(components)}")
+    print(f"components: {', '.join(load_components())}")
 
     (OUT / "_f").mkdir()
 
-    for src in sorted(PAGES.rglob("*.html")):
-        rel = src.relative_to(PAGES)
-        lang = _detect_lang(rel)
-
-        # Determine page file (without lang prefix)
-        page_file = str(rel).replace(f'{lang}/', '') if lang != 'en' else str(rel)
-
-        # 1. Pre-resolve includes, then expand web components
-        html = resolve_includes(src.read_text())
-        html = expand(html, components)
-
-        # 2. Render through template engine (resolves all {{ }} and {% %})
-        ctx = build_page_context(data, ui_strings, lang, page_file, base_url, page_id_map)
-        html = engine.render(html, ctx)
-
-        # 3. Inline CSS to eliminate render-blocking request
-        if inline_css:
-            html = html.replace(
-                '<link rel="stylesheet" href="/static/style.css">',
-                f'<style>{inline_css}</style>',
-            )
+    page_srcs = [str(f.relative_to(PAGES)) for f in sorted(PAGES.rglob("*.html"))]
 
-        # Full page
-        dest = OUT / rel
-        dest.parent.mkdir(parents=True, exist_ok=True)
-        dest.write_text(html)
-
-        # SPA fragment (skip 404)
+    # Create every destination directory up front; mkdir(parents=True) walks
+    # the whole ancestry with stat calls, so do that once per unique dir
+    # rather than once per page.
+    dirs = set()
+    for rel_str in page_srcs:
+        rel = Path(rel_str)
+        dirs.add((OUT / rel).parent)
         if rel.name == '404.html':
-            print(f"  {rel}")
             continue
+        lang = _detect_lang(rel)
         if lang == 'en':
-            frag = OUT / '_f' / rel
+            dirs.add((OUT / '_f' / rel).parent)
         else:
-            page_rel = Path(*rel.parts[1:])
-            frag = OUT / lang / '_f' / page_rel
-        frag.parent.mkdir(parents=True, exist_ok=True)
-        frag.write_text(extract_fragment(html))
+            dirs.add((OUT / lang / '_f' / Path(*rel.parts[1:])).parent)
+    for d in sorted(dirs):
+        d.mkdir(parents=True, exist_ok=True)
+
+    # Component expansion and template rendering are CPU-bound and fully
+    # independent per page, so render in worker processes; the parent does
+    # all the writing to keep dest-directory creation sequential.
+    # The page and fragment writes release the GIL in the syscall, so a
+    # small thread pool overlaps them.
+    with ProcessPoolExecutor(
+        initializer=_init_render_worker, initargs=(base_url, inline_css),
+    ) as ex, ThreadPoolExecutor(max_workers=8) as writers:
+        pending = []
+        for rel_str, html in ex.map(_render_page, page_srcs):
+            rel = Path(rel_str)
+            lang = _detect_lang(rel)
+
+            # Full page
+            dest = OUT / rel
+            pending.append(writers.submit(_write_bytes, dest, html.encode('utf-8')))
+
+            # SPA fragment (skip 404)
+            if rel.name == '404.html':
+                print(f"  {rel}")
+                continue
+            if lang == 'en':
+                frag = OUT / '_f' / rel
+            else:
+                page_rel = Path(*rel.parts[1:])
+                frag = OUT / lang / '_f' / page_rel
+            pending.append(writers.submit(
+                _write_bytes, frag, extract_fragment(html).encode('utf-8')))
 
-        print(f"  {rel}")
+            print(f"  {rel}")
+        for fut in pending:
+            fut.result()
 
     # sitemap.xml
     site_url = os.environ.get("SITE_URL", "https://minihongo.com")
@@ -525,11 +573,13 @@ def _build_to(OUT, base_url):
         precache.append(f"'{url}'")
     precache_js = '[\n  ' + ',\n  '.join(precache) + ',\n]'
 
-    # Cache busting hash
+    # Cache busting hash - feed each path before its contents so renames
+    # bust the cache too, not just content edits
     h = hashlib.sha256()
     for f in sorted(OUT.rglob("*")):
         if f.is_file() and f.name != "sw.js":
-            h.update(f.read_bytes())
+            h.update(str(f.relative_to(OUT)).encode())
+            _hash_file(h, f)
     cache_hash = h.hexdigest()[:8]
 
     sw = OUT / "sw.js"
@@ -546,6 +596,74 @@ def _build_to(OUT, base_url):
     print(f"-> {OUT}/")
 
 
+# Per-process render state, set up once by the pool initializer so the
+# engine, component templates and CSV data are never pickled per page.
+_WORKER = {}
+
+
+def _init_render_worker(base_url, inline_css):
+    data = load_all_data()
+    _WORKER.update(
+        engine=Engine(loader=lambda path: (TEMPLATES / path).read_text()),
+        components=load_components(),
+        data=data,
+        ui_strings=load_ui_strings(data),
+        page_id_map=build_page_id_map(data),
+        base_url=base_url,
+        inline_css=inline_css,
+    )
+
+
+def _render_page(rel_str):
+    """Render one page source to final HTML (runs in a worker process)."""
+    rel = Path(rel_str)
+    lang = _detect_lang(rel)
+
+    # Determine page file (without lang prefix)
+    page_file = str(rel).replace(f'{lang}/', '') if lang != 'en' else str(rel)
+
+    # 1. Pre-resolve includes, then expand web components
+    html = resolve_includes((PAGES / rel).read_text())
+    html = expand(html, _WORKER['components'])
+
+    # 2. Render through template engine (resolves all {{ }} and {% %})
+    ctx = build_page_context(
+        _WORKER['data'], _WORKER['ui_strings'], lang, page_file,
+        _WORKER['base_url'], _WORKER['page_id_map'],
+    )
+    html = _WORKER['engine'].render(html, ctx)
+
+    # 3. Inline CSS to eliminate render-blocking request
+    if _WORKER['inline_css']:
+        html = html.replace(
+            '<link rel="stylesheet" href="/static/style.css">',
+            f"<style>{_WORKER['inline_css']}</style>",
+        )
+
+    return rel_str, html
+
+
+def _write_bytes(path, data):
+    """Write pre-encoded bytes, skipping write_text's TextIOWrapper layer."""
+    with open(path, 'wb') as fh:
+        fh.write(data)
+
+
+def _hash_file(h, f):
+    """Feed a file's contents into a hash without reading it whole.
+
+    Large static assets (fonts, images) are mapped so OpenSSL digests them
+    straight from the page cache; small files go through one read.
+    """
+    with f.open('rb') as fh:
+        size = os.fstat(fh.fileno()).st_size
+        if size > (1 << 20):
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                h.update(mm)
+        else:
+            h.update(fh.read())
+
+
 def _detect_lang(rel_path):
     s = str(rel_path)
     for prefix in ['ja/', 'mh/']:
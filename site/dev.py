@@ -42,6 +42,23 @@ RELOAD_SCRIPT = '''
 '''
 
 
+# Per-file digests keyed by (mtime_ns, size): the watch loop polls twice a
+# second, and re-reading every watched file each tick is almost always wasted
+# I/O - a file only needs rehashing after its stat changes.
+_digest_cache = {}
+
+
+def _file_digest(f):
+    st = f.stat()
+    key = (st.st_mtime_ns, st.st_size)
+    cached = _digest_cache.get(f)
+    if cached and cached[0] == key:
+        return cached[1]
+    digest = hashlib.md5(f.read_bytes()).digest()
+    _digest_cache[f] = (key, digest)
+    return digest
+
+
 def compute_hash():
     """Hash watched source files to detect changes."""
     h = hashlib.md5()
@@ -51,7 +68,7 @@ def compute_hash():
         for f in sorted(d.rglob('*')):
             if f.is_file() and f.suffix in WATCH_EXTENSIONS:
                 try:
-                    h.update(f.read_bytes())
+                    h.update(_file_digest(f))
                 except OSError:
                     pass
     return h.hexdigest()[:12]
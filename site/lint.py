@@ -18,6 +18,7 @@ Usage:
 
 import re
 import sys
+from bisect import bisect_right
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parent
@@ -48,15 +49,28 @@ class LintError:
         return f"{loc}: {self.msg}"
 
 
-def _line_col(source, pos):
+def _line_starts(source):
+    """Offsets where each line begins, for bisect-based position lookups.
+
+    Computed once per file: counting newlines per reported position is
+    quadratic on templates with many nodes.
+    """
+    starts = [0]
+    pos = source.find('\n')
+    while pos >= 0:
+        starts.append(pos + 1)
+        pos = source.find('\n', pos + 1)
+    return starts
+
+
+def _line_col(starts, pos):
     """Convert char offset to (line, col)."""
-    line = source[:pos].count('\n') + 1
-    last_nl = source.rfind('\n', 0, pos)
-    col = pos - last_nl
+    line = bisect_right(starts, pos)
+    col = pos - starts[line - 1] + 1
     return line, col
 
 
-def _check_delimiters(source, filepath):
+def _check_delimiters(source, starts, filepath):
     """Check for unclosed/malformed delimiters."""
     errors = []
     openers = [('{{', '}}'), ('{%', '%}'), ('{#', '#}')]
@@ -69,7 +83,7 @@ def _check_delimiters(source, filepath):
                 break
             end = source.find(close_d, pos + len(open_d))
             if end < 0:
-                line, col = _line_col(source, pos)
+                line, col = _line_col(starts, pos)
                 errors.append(LintError(filepath, line, col,
                     f"Unclosed '{open_d}' - missing '{close_d}'"))
                 break
@@ -79,7 +93,7 @@ def _check_delimiters(source, filepath):
                 nest = inner.find(o2)
                 if nest >= 0:
                     npos = pos + len(open_d) + nest
-                    line, col = _line_col(source, npos)
+                    line, col = _line_col(starts, npos)
                     errors.append(LintError(filepath, line, col,
                         f"Nested '{o2}' inside '{open_d}...{close_d}' block"))
             i = end + len(close_d)
@@ -95,7 +109,7 @@ def _check_delimiters(source, filepath):
             search_start = max(0, pos - 5000)
             open_pos = source.rfind(open_d, search_start, pos)
             if open_pos < 0:
-                line, col = _line_col(source, pos)
+                line, col = _line_col(starts, pos)
                 errors.append(LintError(filepath, line, col,
                     f"Stray '{close_d}' without matching '{open_d}'"))
             i = pos + len(close_d)
@@ -140,13 +154,13 @@ def _check_filter_args(raw, filepath, line):
     return errors
 
 
-def _walk_ast(nodes, filepath, source, errors, known_filters):
+def _walk_ast(nodes, filepath, source, starts, errors, known_filters):
     """Walk AST nodes checking filters and expressions."""
     for node in nodes:
         from engine import ExprNode, ForNode, IfNode, SetNode, IncludeNode
 
         if isinstance(node, ExprNode):
-            line = _find_line_for_raw(source, node.raw)
+            line = _find_line_for_raw(source, starts, node.raw)
             for fname in _extract_filters(node.raw):
                 if fname not in known_filters:
                     errors.append(LintError(filepath, line, 0,
@@ -154,27 +168,27 @@ def _walk_ast(nodes, filepath, source, errors, known_filters):
             errors.extend(_check_filter_args(node.raw, filepath, line))
 
         elif isinstance(node, ForNode):
-            line = _find_line_for_raw(source, node.iter_raw)
+            line = _find_line_for_raw(source, starts, node.iter_raw)
             for fname in _extract_filters(node.iter_raw):
                 if fname not in known_filters:
                     errors.append(LintError(filepath, line, 0,
                         f"Unknown filter: '{fname}'"))
             errors.extend(_check_filter_args(node.iter_raw, filepath, line))
-            _walk_ast(node.body, filepath, source, errors, known_filters)
-            _walk_ast(node.else_body, filepath, source, errors, known_filters)
+            _walk_ast(node.body, filepath, source, starts, errors, known_filters)
+            _walk_ast(node.else_body, filepath, source, starts, errors, known_filters)
 
         elif isinstance(node, IfNode):
             for cond, body in node.branches:
-                line = _find_line_for_raw(source, cond)
+                line = _find_line_for_raw(source, starts, cond)
                 for fname in _extract_filters(cond):
                     if fname not in known_filters:
                         errors.append(LintError(filepath, line, 0,
                             f"Unknown filter: '{fname}'"))
-                _walk_ast(body, filepath, source, errors, known_filters)
-            _walk_ast(node.else_body, filepath, source, errors, known_filters)
+                _walk_ast(body, filepath, source, starts, errors, known_filters)
+            _walk_ast(node.else_body, filepath, source, starts, errors, known_filters)
 
         elif isinstance(node, SetNode):
-            line = _find_line_for_raw(source, node.expr_raw)
+            line = _find_line_for_raw(source, starts, node.expr_raw)
             for fname in _extract_filters(node.expr_raw):
                 if fname not in known_filters:
                     errors.append(LintError(filepath, line, 0,
@@ -184,16 +198,16 @@ def _walk_ast(nodes, filepath, source, errors, known_filters):
         elif isinstance(node, IncludeNode):
             inc_path = TEMPLATES / node.path
             if not inc_path.exists():
-                line = _find_line_for_raw(source, node.path)
+                line = _find_line_for_raw(source, starts, node.path)
                 errors.append(LintError(filepath, line, 0,
                     f"Include file not found: '{node.path}'"))
 
 
-def _find_line_for_raw(source, raw):
+def _find_line_for_raw(source, starts, raw):
     """Find the line number where raw expression text appears."""
     pos = source.find(raw)
     if pos >= 0:
-        return source[:pos].count('\n') + 1
+        return bisect_right(starts, pos)
     return 0
 
 
@@ -201,10 +215,11 @@ def lint_file(filepath, known_filters):
     """Lint a single template file. Returns list of LintError."""
     errors = []
     source = filepath.read_text()
+    starts = _line_starts(source)
     rel = filepath.relative_to(ROOT.parent) if filepath.is_relative_to(ROOT.parent) else filepath
 
     # 1. Check delimiters
-    errors.extend(_check_delimiters(source, rel))
+    errors.extend(_check_delimiters(source, starts, rel))
 
     # 2. Tokenize + parse (catches balance/syntax errors)
     try:
@@ -217,15 +232,15 @@ def lint_file(filepath, known_filters):
         # Extract tag content from error like "Missing {% endfor %}"
         m = re.search(r'\{%\s*(.+?)\s*%\}', msg)
         if m:
-            line = _find_line_for_raw(source, m.group(1))
+            line = _find_line_for_raw(source, starts, m.group(1))
         if not line:
             # For "Missing closing tag" errors, report at end of file
-            line = source.count('\n') + 1
+            line = len(starts)
         errors.append(LintError(rel, line, 0, msg))
         return errors
 
     # 3. Walk AST for filter/include validation
-    _walk_ast(nodes, rel, source, errors, known_filters)
+    _walk_ast(nodes, rel, source, starts, errors, known_filters)
 
     return errors
 
@@ -8,6 +8,10 @@ import sys
 # Small kana that combine with previous character (not separate morae)
 COMBO_KANA = set("ゃゅょャュョァィゥェォ")
 
+# Compiled once: to_reading runs three times per haiku row
+FURIGANA_RE = re.compile(r"[\u4e00-\u9fff\u3005]+【([^】]+)】")
+NON_KANA_RE = re.compile(r"[^\u3040-\u309f\u30a0-\u30ffー]")
+
 
 def to_reading(text: str) -> str:
     """Convert furigana-annotated text to pure hiragana reading.
@@ -15,9 +19,9 @@ def to_reading(text: str) -> str:
     山【やま】の上【うえ】 → やまのうえ
     """
     # Replace kanji【reading】 with just the reading
-    result = re.sub(r"[\u4e00-\u9fff\u3005]+【(.+?)】", r"\1", text)
+    result = FURIGANA_RE.sub(r"\1", text)
     # Remove anything that isn't hiragana/katakana/ー
-    result = re.sub(r"[^\u3040-\u309f\u30a0-\u30ffー]", "", result)
+    result = NON_KANA_RE.sub("", result)
     return result
 
 
@@ -39,6 +39,17 @@ BANNED_WORDS = [
     'やっぱり',
 ]
 
+# Annotated-kanji patterns, compiled once: validation runs them against every
+# row of every content CSV, so per-call re-cache lookups add up.
+_ANNOTATED_RE = re.compile(r'([\u4e00-\u9fff\u3400-\u4dbf]+)【([^】]+)】')
+_COUNTER_RE = re.compile(r'[\u4e00-\u9fff\u3400-\u4dbf]+【[^】]+】つ')
+# Single alternation so validate_text walks each field once: a kanji run is
+# either annotated (followed by 【reading】) or bare, and lastgroup tells us which.
+_TOKEN_RE = re.compile(
+    r'(?P<kanji>[\u4e00-\u9fff\u3400-\u4dbf]+)【(?P<reading>[^】]+)】'
+    r'|(?P<bare>[\u4e00-\u9fff\u3400-\u4dbf]+)'
+)
+
 # Counter readings: native readings with つ counter
 COUNTER_READINGS = {
     '一': 'ひと',
@@ -121,10 +132,7 @@ def build_vocab():
             text = w.get(col, '')
             if not text:
                 continue
-            for m in re.finditer(
-                r'([\u4e00-\u9fff\u3400-\u4dbf]+)【([^】]+)】', text
-            ):
-                kanji, reading = m.group(1), m.group(2)
+            for kanji, reading in _ANNOTATED_RE.findall(text):
                 vocab[kanji].add(reading)
                 if len(kanji) == 1:
                     char_readings[kanji].add(reading)
@@ -165,10 +173,7 @@ def build_vocab():
 
 def is_counter_context(text, start):
     """Check if annotated kanji at position is followed by つ."""
-    m = re.match(
-        r'[\u4e00-\u9fff\u3400-\u4dbf]+【[^】]+】つ', text[start:]
-    )
-    return m is not None
+    return _COUNTER_RE.match(text, start) is not None
 
 
 def validate_text(text, vocab, char_readings, source):
@@ -186,10 +191,16 @@ def validate_text(text, vocab, char_readings, source):
                 'issue': f'banned word: {word}',
             })
 
-    for m in re.finditer(
-        r'([\u4e00-\u9fff\u3400-\u4dbf]+)【([^】]+)】', text
-    ):
-        kanji, reading = m.group(1), m.group(2)
+    for m in _TOKEN_RE.finditer(text):
+        if m.lastgroup == 'bare':
+            # Kanji run with no furigana
+            if m.group('bare') != '々':
+                errors.append({
+                    'source': source,
+                    'issue': f'bare kanji (no furigana): {m.group("bare")}',
+                })
+            continue
+        kanji, reading = m.group('kanji'), m.group('reading')
 
         # Counter readings exception
         if kanji in COUNTER_READINGS and is_counter_context(text, m.start()):
@@ -231,17 +242,6 @@ def validate_text(text, vocab, char_readings, source):
             'issue': f'unknown kanji: {kanji} in {kanji}【{reading}】',
         })
 
-    # Check for bare kanji (missing furigana)
-    stripped = re.sub(r'[\u4e00-\u9fff\u3400-\u4dbf]+【[^】]+】', '', text)
-    bare = re.findall(r'[\u4e00-\u9fff\u3400-\u4dbf]+', stripped)
-    for k in bare:
-        if k == '々':
-            continue
-        errors.append({
-            'source': source,
-            'issue': f'bare kanji (no furigana): {k}',
-        })
-
     return errors
 
 
@@ -329,7 +329,7 @@ def check_count_claims(expected):
         for row in load_csv(csv_name):
             row_id = row.get('id', row.get('key', '?'))
             for col, text in row.items():
-                if not text:
+                if not text or not isinstance(text, str):
                     continue
                 for pat in COUNT_CLAIM_PATTERNS:
                     for m in pat.finditer(text):